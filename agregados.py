@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+
+class CuboDiario:
+    """Contagem de notícias por dia x categoria, montada uma vez por atualização dos dados.
+
+    KPIs e gráficos do Painel de Insights saem de fatias desta matriz (dias contínuos nas linhas,
+    categorias nas colunas), sem voltar às linhas brutas.
+    """
+
+    def __init__(self, dias, categorias, contagens):
+        self.dias = dias
+        self.categorias = list(categorias)
+        self.contagens = contagens
+
+    @classmethod
+    def construir(cls, df, linhas=None, coluna_data="data_noticia", coluna_categoria="categoria"):
+        """`linhas`: posições de um recorte de df (None = todas), sem copiar o frame"""
+        if linhas is None: linhas = slice(None)
+        dias = df[coluna_data].to_numpy(dtype="datetime64[D]")[linhas]
+        validos = ~np.isnat(dias)
+        if not validos.any():
+            return cls(np.array([], dtype="datetime64[D]"), [], np.zeros((0, 0), dtype=np.int32))
+        categorias, codigos = np.unique(df[coluna_categoria].to_numpy()[linhas].astype(str), return_inverse=True)
+        primeiro, ultimo = dias[validos].min(), dias[validos].max()
+        linhas = (dias[validos] - primeiro).astype(np.int64)
+        contagens = np.zeros((int((ultimo - primeiro).astype(np.int64)) + 1, len(categorias)), dtype=np.int32)
+        np.add.at(contagens, (linhas, codigos[validos]), 1)
+        return cls(np.arange(primeiro, ultimo + 1), categorias, contagens)
+
+    def fatiar(self, d_inicio, d_fim, setores=None):
+        """Sub-cubo do período [d_inicio, d_fim] restrito aos setores escolhidos (vazio = todos)"""
+        i = np.searchsorted(self.dias, np.datetime64(d_inicio, "D"), side="left")
+        j = np.searchsorted(self.dias, np.datetime64(d_fim, "D"), side="right")
+        colunas = [k for k, c in enumerate(self.categorias) if not setores or c in setores]
+        return CuboDiario(self.dias[i:j], [self.categorias[k] for k in colunas], self.contagens[i:j][:, colunas])
+
+    # ==========================================================================
+    # RESPOSTAS PARA O PAINEL
+    # ==========================================================================
+    @property
+    def total(self):
+        return int(self.contagens.sum())
+
+    def por_categoria(self):
+        """Equivalente a value_counts() da coluna categoria (maior volume primeiro)"""
+        serie = pd.Series(self.contagens.sum(axis=0), index=self.categorias, dtype="int64")
+        return serie[serie > 0].sort_values(ascending=False, kind="stable")
+
+    def setor_destaque(self):
+        """Equivalente a mode()[0]: a categoria mais frequente, empates resolvidos em ordem alfabética"""
+        serie = self.por_categoria()
+        if serie.empty: return None
+        return min(serie.index[serie == serie.iloc[0]])
+
+    def ultima_data(self):
+        com_noticias = np.flatnonzero(self.contagens.sum(axis=1))
+        return pd.Timestamp(self.dias[com_noticias[-1]]) if len(com_noticias) else None
+
+    def serie_geral(self):
+        """Notícias por dia (só dias com publicação), colunas data_noticia e Qtd"""
+        qtd = self.contagens.sum(axis=1)
+        mask = qtd > 0
+        return pd.DataFrame({"data_noticia": self.dias[mask], "Qtd": qtd[mask]})
+
+    def serie_por_setor(self):
+        """Notícias por dia e categoria (formato longo), colunas data_noticia, categoria e Qtd"""
+        linhas, colunas = np.nonzero(self.contagens)
+        return pd.DataFrame({
+            "data_noticia": self.dias[linhas],
+            "categoria": np.array(self.categorias, dtype=object)[colunas],
+            "Qtd": self.contagens[linhas, colunas]
+        })
@@ -1,11 +1,14 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import unicodedata
-from supabase import create_client
+import numpy as np
 from datetime import datetime, date, timedelta
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
+from consultas import TAMANHO_PAGINA, Filtros, buscar_conteudo, buscar_todos
+from cache_dados import ARQUIVO_SNAPSHOT, BaseNoticias
+from normalizacao import preparar_noticias, selecionar
+from agregados import CuboDiario
+from telemetria import cronometrar, span, telemetria
+# plotly, wordcloud/matplotlib (termos), scipy (boletim) e o cliente supabase são importados só
+# quando a página ou a consulta que os usa aparece: a partida a frio não paga por eles
 
 # ==============================================================================
 # 1. DESIGN & IDENTIDADE VISUAL (CSS PREMIUM FINAL)
@@ -76,7 +79,7 @@ st.markdown("""
 # 2. SISTEMA DE ESTADO E LIMPEZA
 # ==============================================================================
 if 'pagina_ativa' not in st.session_state: st.session_state.pagina_ativa = "noticias"
-if 'limit' not in st.session_state: st.session_state.limit = 100
+if 'pagina_feed' not in st.session_state: st.session_state.pagina_feed = 0
 
 def reset_filtros():
     """Limpa as chaves de estado sem disparar mensagens visuais"""
@@ -86,25 +89,68 @@ def reset_filtros():
 
 def set_pag(name): st.session_state.pagina_ativa = name
 
-def limpar_titulo(titulo):
-    if not isinstance(titulo, str): return titulo
-    termos = ["Agência iNFRA", "AGÊNCIA INFRA", "Agencia iNFRA", "Agencia Infra", "iNFRA"]
-    for t in termos: titulo = titulo.replace(t, "").strip()
-    return titulo.lstrip(" -|: ")
+def mudar_pagina_feed(passo): st.session_state.pagina_feed += passo
 
 @st.cache_resource
 def init_connection():
+    from supabase import create_client
     return create_client(st.secrets["SUPABASE_URL"], st.secrets["SUPABASE_KEY"])
 
-@st.cache_data(ttl=300)
+@st.cache_resource
+def base_noticias():
+    """Base em memória do processo, compartilhada entre sessões e atualizada só com as notícias novas.
+
+    Na partida a frio vem do snapshot em disco e o banco é consultado em segundo plano.
+    """
+    return BaseNoticias(preparar=preparar_noticias, conectar=init_connection,
+                        arquivo_snapshot=ARQUIVO_SNAPSHOT, em_segundo_plano=True)
+
+@cronometrar("app.carregar_dados")
 def carregar_dados():
-    supabase = init_connection()
-    res = supabase.table("noticias_infra").select("*").order("data_noticia", desc=True).limit(6000).execute()
-    df = pd.DataFrame(res.data)
-    if not df.empty:
-        df['data_noticia'] = pd.to_datetime(df['data_noticia'])
-        df['titulo_limpo'] = df['titulo'].apply(limpar_titulo)
-    return df
+    """Base dos painéis: só as colunas exibidas (sem o conteúdo)"""
+    return base_noticias().obter()
+
+def carregar_indice():
+    """Índice invertido (sem acentos) de título + conteúdo: montado na primeira busca, depois só recebe as novas"""
+    return base_noticias().indice()
+
+@st.cache_data(ttl=3600, max_entries=500)
+def carregar_conteudo(link):
+    """Corpo da notícia já formatado para o st.write, memorizado por link"""
+    return (buscar_conteudo(init_connection(), link) or "").replace("$", r"\$").replace("•", "\n\n- ")
+
+def carregar_cubo(df):
+    """Contagens dia x categoria da base inteira; os KPIs e gráficos do painel fatiam esta matriz"""
+    return base_noticias().derivado("cubo", df, CuboDiario.construir)
+
+def posicoes_links(df):
+    """Índice link -> posição em df, para levar o resultado da busca às linhas do frame"""
+    return base_noticias().derivado("links", df, lambda d: pd.Index(d['link']))
+
+def carregar_termos(df):
+    """Contagem de termos dos títulos por notícia (posições de df), com cache de imagens da nuvem"""
+    from termos import EstatisticasTermos
+    return base_noticias().derivado("termos", df, lambda d: EstatisticasTermos.construir(d['titulo_limpo'].tolist()))
+
+def carregar_conteudos_semana(df, d_inicio, d_fim):
+    """{link: conteúdo} da semana do boletim (só o começo do texto, que é o que o agrupamento usa).
+
+    Lido uma vez por versão da base, como as histórias: a semana sai da data mais recente de df.
+    """
+    def ler(_):
+        linhas = buscar_todos(init_connection(), ["link", "conteudo"], filtros=Filtros(d_inicio, d_fim))
+        return {r["link"]: (r["conteudo"] or "")[:2000] for r in linhas}
+    return base_noticias().derivado("conteudos_semana", df, ler)
+
+def carregar_boletim(df):
+    """Histórias do boletim em cache por (semana, categoria), refeitas quando os dados mudam"""
+    from boletim import BoletimSemanal
+    return base_noticias().derivado("boletim", df, lambda d: BoletimSemanal())
+
+def citar(historia):
+    """Manchete representativa da história, com o tamanho do grupo e o link"""
+    qtd = f" ({historia['noticias']} notícias)" if historia['noticias'] > 1 else ""
+    return f"<b>{historia['titulo']}</b>{qtd} <a href='{historia['link']}' class='news-link'>🔗</a>"
 
 df_bruto = carregar_dados()
 
@@ -125,6 +171,10 @@ with st.sidebar:
     d_inicio = st.date_input("Início", key="data_ini_input", value=date(2026, 1, 1), 
                             min_value=date(2025, 1, 1), max_value=date(2026, 12, 31), format="DD/MM/YYYY")
     d_fim = st.date_input("Fim", value=max_banco, min_value=date(2025, 1, 1), max_value=date(2026, 12, 31), format="DD/MM/YYYY")
+    if base_noticias().desatualizada:
+        st.caption("⚠️ Base desatualizada: o banco não respondeu; nova tentativa em alguns minutos.")
+    elif base_noticias().do_snapshot:
+        st.caption("🕒 Base da última sessão; buscando notícias novas...")
 
     st.markdown('<p class="sidebar-label">Setores</p>', unsafe_allow_html=True)
     cats = sorted(df_bruto['categoria'].unique().tolist()) if not df_bruto.empty else []
@@ -136,14 +186,25 @@ with st.sidebar:
     st.markdown("<br>", unsafe_allow_html=True)
     st.button("🔄 LIMPAR FILTROS", on_click=reset_filtros)
 
-# Filtragem Global
-df_f = df_bruto.copy()
-if not df_f.empty:
-    df_f = df_f[(df_f['data_noticia'].dt.date >= d_inicio) & (df_f['data_noticia'].dt.date <= d_fim)]
-    if sel_setores: df_f = df_f[df_f['categoria'].isin(sel_setores)]
-    if busca:
-        df_f = df_f[df_f['titulo_limpo'].str.contains(busca, case=False, na=False) | 
-                    df_f['conteudo'].str.contains(busca, case=False, na=False)]
+# Filtragem Global (a busca textual usa o índice invertido e ordena por relevância)
+filtros = Filtros(d_inicio, d_fim, tuple(sel_setores), busca.strip())
+if st.session_state.get("filtros_feed") != filtros:
+    st.session_state.filtros_feed = filtros
+    st.session_state.pagina_feed = 0
+
+# O recorte é um array de posições em df_bruto; as linhas só são copiadas na hora de exibir
+with span("app.filtros", busca=bool(filtros.busca)) as s_filtros:
+    linhas_f = selecionar(df_bruto, d_inicio, d_fim, sel_setores)
+    if filtros.busca and len(linhas_f):
+        indice, links_indice = carregar_indice()
+        ranking = posicoes_links(df_bruto).get_indexer(links_indice[indice.buscar(filtros.busca)])
+        ranking = ranking[ranking >= 0]
+        linhas_f = ranking[np.isin(ranking, linhas_f)]
+    s_filtros.anotar(linhas=len(linhas_f))
+
+def pagina_feed(pagina):
+    """Janela do recorte (já na ordem do banco ou, com busca, na ordem de relevância), sem ida ao banco"""
+    return df_bruto.iloc[linhas_f[pagina * TAMANHO_PAGINA:(pagina + 1) * TAMANHO_PAGINA]], len(linhas_f)
 
 st.markdown("""
 <div class="main-title-container">
@@ -160,36 +221,57 @@ st.markdown("""
 # 4. PÁGINAS
 # ==============================================================================
 
-if st.session_state.pagina_ativa == "noticias":
-    if not df_f.empty:
-        st.markdown(f"### Feed ({len(df_f)} resultados)")
-        for _, r in df_f.head(st.session_state.limit).iterrows():
-            with st.expander(f"{r['data_noticia'].strftime('%d/%m/%Y')} | {r['titulo_limpo']}"):
-                st.markdown(f"<span style='color:#F75D00; font-weight:600;'>Setor: {r['categoria']}</span>", unsafe_allow_html=True)
-                st.write(r['conteudo'].replace("$", r"\$").replace("•", "\n\n- "))
-                st.link_button("🔗 Ver conteúdo original", r['link'])
-        if len(df_f) > st.session_state.limit:
-            if st.button("📥 Carregar Mais"): st.session_state.limit += 100; st.rerun()
+@cronometrar("app.pagina.noticias")
+def pagina_noticias():
+    # Só a janela atual é desenhada: o custo de cada rerun não cresce com a página visitada
+    df_pag, total = pagina_feed(st.session_state.pagina_feed)
+    if total:
+        n_paginas = -(-total // TAMANHO_PAGINA)
+        if st.session_state.pagina_feed >= n_paginas: # Base encolheu desde a última visita
+            st.session_state.pagina_feed = n_paginas - 1
+            df_pag, total = pagina_feed(st.session_state.pagina_feed)
+        atual = st.session_state.pagina_feed
+        st.markdown(f"### Feed ({total} resultados)")
+        for r in df_pag[['data_noticia', 'titulo_limpo', 'categoria', 'link']].itertuples(index=False):
+            exp = st.expander(f"{r.data_noticia.strftime('%d/%m/%Y')} | {r.titulo_limpo}",
+                              key=f"exp_{r.link}", on_change="rerun")
+            if exp.open:
+                with exp:
+                    st.markdown(f"<span style='color:#F75D00; font-weight:600;'>Setor: {r.categoria}</span>", unsafe_allow_html=True)
+                    st.write(carregar_conteudo(r.link))
+                    st.link_button("🔗 Ver conteúdo original", r.link)
+
+        if n_paginas > 1:
+            c_ant, c_pag, c_prox = st.columns([1, 1, 1])
+            c_ant.button("◀ Anterior", on_click=mudar_pagina_feed, args=(-1,), disabled=atual == 0)
+            c_pag.markdown(f"<p style='text-align:center; margin-top:1.3rem;'>Página {atual + 1} de {n_paginas}</p>", unsafe_allow_html=True)
+            c_prox.button("Próxima ▶", on_click=mudar_pagina_feed, args=(1,), disabled=atual >= n_paginas - 1)
     else: st.info("Nenhuma notícia encontrada.")
 
-elif st.session_state.pagina_ativa == "insights":
-    if not df_f.empty:
+@cronometrar("app.pagina.insights")
+def pagina_insights():
+    import plotly.express as px
+    from termos import renderizar_nuvem
+    # Com busca textual o recorte é por linha, então o cubo é montado só sobre o resultado
+    cubo_base = CuboDiario.construir(df_bruto, linhas_f) if filtros.busca else carregar_cubo(df_bruto)
+    cubo = cubo_base.fatiar(d_inicio, d_fim, sel_setores)
+    if cubo.total:
         k1, k2, k3, k4 = st.columns(4)
-        k1.metric("Volume no Período", len(df_f))
-        k2.metric("Setor em Destaque", df_f['categoria'].mode()[0])
+        k1.metric("Volume no Período", cubo.total)
+        k2.metric("Setor em Destaque", cubo.setor_destaque())
         k3.metric("Total na Base", len(df_bruto))
-        k4.metric("Última Captura", df_f['data_noticia'].max().strftime('%d/%m/%Y'))
+        k4.metric("Última Captura", cubo.ultima_data().strftime('%d/%m/%Y'))
 
         st.divider()
         st.markdown('<p class="chart-title">Evolução Temporal das Publicações</p>', unsafe_allow_html=True)
         modo_evol = st.radio("Filtro:", ["Geral", "Por Setor"], horizontal=True, label_visibility="collapsed")
         
         if modo_evol == "Geral":
-            df_t = df_f.groupby(df_f['data_noticia'].dt.date).size().reset_index(name='Qtd')
+            df_t = cubo.serie_geral()
             fig_evol = px.area(df_t, x='data_noticia', y='Qtd', labels={'data_noticia': 'Data', 'Qtd': 'Notícias'})
             fig_evol.update_traces(line_color='#F75D00', fillcolor='rgba(247, 93, 0, 0.2)')
         else:
-            df_t = df_f.groupby([df_f['data_noticia'].dt.date, 'categoria']).size().reset_index(name='Qtd')
+            df_t = cubo.serie_por_setor()
             fig_evol = px.line(df_t, x='data_noticia', y='Qtd', color='categoria')
         
         fig_evol.update_layout(
@@ -206,7 +288,7 @@ elif st.session_state.pagina_ativa == "insights":
         col_bar, col_wc = st.columns([1, 1])
         with col_bar:
             st.markdown('<p class="chart-title">Volume por Categoria</p>', unsafe_allow_html=True)
-            cont = df_f['categoria'].value_counts().head(10).sort_values(ascending=True)
+            cont = cubo.por_categoria().head(10).sort_values(ascending=True)
             fig_freq = px.bar(x=cont.values, y=cont.index, orientation='h', color_discrete_sequence=['#F75D00'])
             fig_freq.update_traces(texttemplate='%{x}', textposition='outside', textfont_color='white', textfont_size=13)
             fig_freq.update_layout(height=400, plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', xaxis=dict(visible=False), yaxis=dict(title=None))
@@ -214,19 +296,19 @@ elif st.session_state.pagina_ativa == "insights":
 
         with col_wc:
             st.markdown('<p class="chart-title">Temas em Destaque</p>', unsafe_allow_html=True)
-            texto = " ".join(df_f['titulo_limpo'].astype(str)).lower()
-            ignore = {"a", "ao", "por", "à", "e", "o", "as", "os", "de", "do", "da", "dos", "das", "em", "no", "na", "nos", "nas", "para", "com", "que", "se", "sobre", "mais", "até", "ate", "foi", "está", "tem", "diz", "nova", "onde", "portanto", "ma", "r", "dia", "não", "cade"}
-            if texto.strip():
-                wc = WordCloud(width=800, height=400, background_color='#000000', colormap='Oranges', stopwords=ignore, max_words=17, prefer_horizontal=1.0).generate(texto)
-                fig_wc, ax = plt.subplots(figsize=(10, 5), facecolor='#000000')
-                ax.imshow(wc, interpolation='bilinear'); ax.axis("off")
-                st.pyplot(fig_wc, width='stretch')
+            # Contagens por notícia pré-calculadas; a imagem fica em cache (LRU) por combinação de filtros
+            termos = carregar_termos(df_bruto)
+            freq = termos.frequencias(linhas_f)
+            if freq:
+                imagem = termos.imagens.obter(filtros, lambda: renderizar_nuvem(freq))
+                st.image(imagem, width='stretch')
 
 # --- PÁGINA: BOLETIM SEMANAL (NARRATIVA FINAL) ---
-elif st.session_state.pagina_ativa == "resumo":
+@cronometrar("app.pagina.resumo")
+def pagina_resumo():
     referencia = df_bruto['data_noticia'].max().date() if not df_bruto.empty else date.today()
     inicio_semana = referencia - timedelta(days=7)
-    df_semana = df_bruto[df_bruto['data_noticia'].dt.date >= inicio_semana]
+    df_semana = df_bruto.iloc[selecionar(df_bruto, inicio_semana, referencia)]
     
     st.markdown(f"""
     <div class="bulletin-header">
@@ -238,6 +320,8 @@ elif st.session_state.pagina_ativa == "resumo":
     """, unsafe_allow_html=True)
 
     if not df_semana.empty:
+        boletim = carregar_boletim(df_bruto)
+        conteudos = carregar_conteudos_semana(df_bruto, inicio_semana, referencia)
         c1, c2 = st.columns([1, 1])
         c1.metric("Volume na Semana", len(df_semana))
         c2.metric("Setor em Evidência", df_semana['categoria'].mode()[0])
@@ -247,20 +331,34 @@ elif st.session_state.pagina_ativa == "resumo":
             df_cat = df_semana[df_semana['categoria'] == cat]
             
             with st.expander(f"📂 {cat.replace('_', ' ')} — ({len(df_cat)} notícias)", expanded=True):
-                titulos = df_cat['titulo_limpo'].tolist()
-                links = df_cat['link'].tolist()
-                
+                # Histórias agrupadas por similaridade: a maior da semana abre a narrativa
+                hs = boletim.historias(inicio_semana, cat, df_cat, conteudos)
+
                 narrativa = f"Nesta última semana, a área de <span class='highlight-sector'>{cat.replace('_', ' ')}</span> concentrou {len(df_cat)} publicações de relevância. "
-                narrativa += f"O foco principal recaiu sobre <b>{titulos[0]}</b> <a href='{links[0]}' class='news-link'>🔗</a>. "
-                
-                if len(titulos) > 1:
-                    narrativa += f"Também observou-se repercussão acerca de <b>{titulos[1]}</b> <a href='{links[1]}' class='news-link'>🔗</a>"
-                    if len(titulos) > 2:
-                        narrativa += f", além de desdobramentos em <b>{titulos[2]}</b> <a href='{links[2]}' class='news-link'>🔗</a>."
+                narrativa += f"O foco principal recaiu sobre {citar(hs[0])}. "
+
+                if len(hs) > 1:
+                    narrativa += f"Também observou-se repercussão acerca de {citar(hs[1])}"
+                    if len(hs) > 2:
+                        narrativa += f", além de desdobramentos em {citar(hs[2])}."
                     else:
                         narrativa += "."
-                
+
                 st.markdown(f"<div class='narrative-box'>{narrativa}</div>", unsafe_allow_html=True)
                 st.markdown("<br>", unsafe_allow_html=True)
     else:
-        st.warning("Aguardando novas notícias para compilar o boletim.")
\ No newline at end of file
+        st.warning("Aguardando novas notícias para compilar o boletim.")
+
+PAGINAS = {"noticias": pagina_noticias, "insights": pagina_insights, "resumo": pagina_resumo}
+PAGINAS[st.session_state.pagina_ativa]()
+
+# ==============================================================================
+# 5. TELEMETRIA (SÓ COM INFRA_TELEMETRIA=1)
+# ==============================================================================
+if telemetria.ativa:
+    with st.sidebar.expander("⏱️ Telemetria"):
+        resumo = telemetria.resumo()
+        if resumo["spans"]:
+            tempos = pd.DataFrame(resumo["spans"]).T[["n", "p50_ms", "p95_ms", "max_ms"]]
+            st.dataframe(tempos, width='stretch')
+        st.json({**resumo["contadores"], **{f"base.{k}": v for k, v in base_noticias().estatisticas().items()}})
@@ -0,0 +1,139 @@
+"""Armazenamento do histórico de notícias (sistema de registro do robô e do upload).
+
+Uso avulso para gerar o relatório em Excel: python armazenamento.py --exportar-excel [arquivo.xlsx]
+"""
+import argparse
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+from telemetria import cronometrar
+
+ARQUIVO_BANCO = "AgenciaInfra_Historico.db"
+ARQUIVO_EXCEL = "AgenciaInfra_Historico.xlsx"
+
+# Mesmos nomes de colunas da tabela noticias_infra no Supabase
+COLUNAS = ["data_noticia", "fonte", "categoria", "titulo", "conteudo", "link"]
+COLUNAS_PLANILHA = {
+    "Título": "titulo",
+    "Conteúdo": "conteudo",
+    "Link": "link",
+    "Categoria": "categoria",
+    "Fonte": "fonte"
+}
+
+def do_formato_planilha(df):
+    """Converte linhas no formato da planilha/robô (Data dd/mm/aaaa, Título...) para as colunas do banco"""
+    df = df.rename(columns=COLUNAS_PLANILHA)
+    df["data_noticia"] = pd.to_datetime(df["Data"], format="%d/%m/%Y", errors="coerce").dt.strftime("%Y-%m-%d")
+    df = df.astype(object).where(df.notna(), None)
+    return df[COLUNAS]
+
+def para_formato_planilha(df):
+    df = df.rename(columns={v: k for k, v in COLUNAS_PLANILHA.items()})
+    df.insert(0, "Data", pd.to_datetime(df.pop("data_noticia"), errors="coerce").dt.strftime("%d/%m/%Y").fillna("S/D"))
+    return df[["Data", "Título", "Link", "Categoria", "Fonte", "Conteúdo"]]
+
+# ==============================================================================
+# BACKENDS
+# ==============================================================================
+class Armazenamento(ABC):
+    """Interface: inserções apenas de acréscimo (link único) e leitura só das colunas pedidas"""
+
+    @abstractmethod
+    def inserir(self, df):
+        """Grava as linhas cujo link ainda não existe; devolve quantas foram inseridas"""
+
+    @abstractmethod
+    def ler(self, colunas=None):
+        """DataFrame com as `colunas` pedidas (todas, se None)"""
+
+    @abstractmethod
+    def __len__(self):
+        """Quantidade de notícias guardadas"""
+
+    def fechar(self):
+        pass
+
+
+class ArmazenamentoSQLite(Armazenamento):
+    def __init__(self, caminho=ARQUIVO_BANCO):
+        self.caminho = caminho
+        self.conexao = sqlite3.connect(caminho)
+        with self.conexao:
+            self.conexao.execute("""
+                CREATE TABLE IF NOT EXISTS noticias (
+                    id INTEGER PRIMARY KEY,
+                    data_noticia TEXT,
+                    fonte TEXT,
+                    categoria TEXT,
+                    titulo TEXT,
+                    conteudo TEXT,
+                    link TEXT NOT NULL,
+                    inserido_em TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )""")
+            self.conexao.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_noticias_link ON noticias (link)")
+            self.conexao.execute("CREATE INDEX IF NOT EXISTS idx_noticias_data ON noticias (data_noticia)")
+
+    @cronometrar("historico.inserir")
+    def inserir(self, df):
+        linhas = df[COLUNAS].itertuples(index=False, name=None)
+        antes = self.conexao.total_changes
+        with self.conexao:
+            self.conexao.executemany(
+                f"INSERT OR IGNORE INTO noticias ({', '.join(COLUNAS)}) VALUES ({', '.join('?' * len(COLUNAS))})",
+                linhas
+            )
+        return self.conexao.total_changes - antes
+
+    def ler(self, colunas=None):
+        colunas = colunas or COLUNAS
+        invalidas = set(colunas) - set(COLUNAS) - {"id", "inserido_em"}
+        if invalidas: raise ValueError(f"Colunas desconhecidas: {sorted(invalidas)}")
+        return pd.read_sql_query(f"SELECT {', '.join(colunas)} FROM noticias ORDER BY data_noticia DESC, id DESC",
+                                 self.conexao)
+
+    def __len__(self):
+        return self.conexao.execute("SELECT COUNT(*) FROM noticias").fetchone()[0]
+
+    def fechar(self):
+        self.conexao.close()
+
+
+def abrir_armazenamento(caminho=ARQUIVO_BANCO, excel_legado=ARQUIVO_EXCEL):
+    """Abre o banco; na primeira vez, importa o histórico da planilha antiga (se existir)"""
+    novo = not os.path.exists(caminho)
+    armazenamento = ArmazenamentoSQLite(caminho)
+    if novo and excel_legado and os.path.exists(excel_legado):
+        df = pd.read_excel(excel_legado, sheet_name="Visão Geral")
+        qtd = armazenamento.inserir(do_formato_planilha(df))
+        print(f"📦 Histórico migrado da planilha: {qtd} notícias.")
+    return armazenamento
+
+# ==============================================================================
+# RELATÓRIO EXCEL (SOB DEMANDA)
+# ==============================================================================
+@cronometrar("historico.exportar_excel")
+def exportar_excel(armazenamento, caminho=ARQUIVO_EXCEL):
+    df_final = para_formato_planilha(armazenamento.ler())
+    with pd.ExcelWriter(caminho, engine='openpyxl') as writer:
+        df_final.to_excel(writer, sheet_name="Visão Geral", index=False)
+        for cat in df_final['Categoria'].unique():
+            df_cat = df_final[df_final['Categoria'] == cat].drop(columns=['Categoria'])
+            df_cat.to_excel(writer, sheet_name=str(cat)[:30], index=False)
+    return len(df_final)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--exportar-excel", nargs="?", const=ARQUIVO_EXCEL, metavar="ARQUIVO")
+    args = parser.parse_args()
+    armazenamento = abrir_armazenamento()
+    if args.exportar_excel:
+        qtd = exportar_excel(armazenamento, args.exportar_excel)
+        print(f"✅ Relatório gerado: {args.exportar_excel} ({qtd} notícias).")
+    else:
+        print(f"📦 {len(armazenamento)} notícias em {armazenamento.caminho}.")
+    armazenamento.fechar()
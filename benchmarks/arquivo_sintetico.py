@@ -0,0 +1,63 @@
+"""Gera um acervo sintético no formato das linhas de noticias_infra (10 mil a 500 mil notícias).
+
+Vocabulário com frequência tipo Zipf, títulos com a assinatura "Agência iNFRA" como os raspados,
+datas espalhadas por ~18 meses e categorias com volumes desiguais, como no acervo real.
+
+Uso: python benchmarks/arquivo_sintetico.py --linhas 100000 --saida acervo.jsonl
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_busca import PALAVRAS
+from servidor_local import SLUGS
+
+# Participação aproximada de cada categoria no acervo
+PESOS_CATEGORIAS = {"Energia": 30, "Transporte": 25, "Giro": 15, "Na Transição": 8, "Oleo_Gas": 7,
+                    "Saneamento": 6, "Mineração": 4, "Cidades": 3, "Eventos": 2}
+SILABAS = ["ba", "ca", "de", "fi", "go", "la", "me", "no", "pa", "ra", "se", "ta", "vi", "ção", "ões"]
+ASSINATURAS = ["Agência iNFRA - ", "AGÊNCIA INFRA: ", "", "", ""]
+
+def gerar_arquivo(n, semente=42, inicio=date(2025, 1, 1), dias=540, palavras_corpo=200, tamanho_vocabulario=5000):
+    """Lista de dicionários com data_noticia, fonte, categoria, titulo, conteudo e link"""
+    aleatorio = random.Random(semente)
+    vocabulario = PALAVRAS + ["".join(aleatorio.choices(SILABAS, k=aleatorio.randint(2, 4)))
+                              for _ in range(tamanho_vocabulario)]
+    aleatorio.shuffle(vocabulario)
+    # Pesos acumulados uma vez: random.choices refaria a soma a cada chamada
+    acumulados = list(itertools.accumulate(1 / (i + 1) for i in range(len(vocabulario))))
+    categorias, pesos_categorias = list(PESOS_CATEGORIAS), list(PESOS_CATEGORIAS.values())
+    linhas = []
+    for i in range(n):
+        categoria = aleatorio.choices(categorias, pesos_categorias)[0]
+        titulo = " ".join(aleatorio.choices(vocabulario, cum_weights=acumulados, k=aleatorio.randint(6, 12))).capitalize()
+        corpo = " ".join(aleatorio.choices(vocabulario, cum_weights=acumulados, k=palavras_corpo))
+        linhas.append({
+            "data_noticia": (inicio + timedelta(days=aleatorio.randrange(dias))).isoformat(),
+            "fonte": "Agência iNFRA",
+            "categoria": categoria,
+            "titulo": aleatorio.choice(ASSINATURAS) + titulo,
+            # Parágrafos com marcadores e valores em R$, como os textos que o feed formata
+            "conteudo": f"• {corpo[:len(corpo) // 2]}\n• R$ {aleatorio.randint(1, 999)} milhões {corpo[len(corpo) // 2:]}",
+            "link": f"https://agenciainfra.com/blog/{SLUGS[categoria]}-{i}/",
+        })
+    return linhas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=10000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", default="acervo_sintetico.jsonl")
+    args = parser.parse_args()
+
+    with open(args.saida, "w", encoding="utf-8") as f:
+        for linha in gerar_arquivo(args.linhas, args.semente):
+            f.write(json.dumps(linha, ensure_ascii=False) + "\n")
+    print(f"✅ {args.linhas} notícias gravadas em {args.saida}")
@@ -0,0 +1,70 @@
+"""Mede o agrupamento de histórias do Boletim Semanal para todos os setores de uma semana.
+
+Cada setor recebe algumas "histórias" (notícias que compartilham um conjunto próprio de palavras)
+misturadas a notícias avulsas com vocabulário comum. O script mede a primeira montagem (sem cache)
+e a repetida (cache por semana x categoria), e confere que as histórias foram reencontradas.
+
+Uso: python benchmarks/bench_boletim.py --por-setor 80 --setores 10
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boletim import BoletimSemanal
+from bench_busca import PALAVRAS
+
+SILABAS = ["ba", "ca", "de", "fi", "go", "la", "me", "no", "pa", "ra", "se", "ta", "vi", "ção", "ões"]
+
+def palavra_rara():
+    return "".join(random.choices(SILABAS, k=4))
+
+def gerar_setor(n, n_historias, dia_final):
+    historias = [[palavra_rara() for _ in range(6)] for _ in range(n_historias)]
+    titulos, conteudos, origem = [], [], []
+    for _ in range(n):
+        h = random.randrange(n_historias + 2) # Parte das notícias não pertence a nenhuma história
+        chave = historias[h] if h < n_historias else [palavra_rara() for _ in range(6)]
+        titulos.append(" ".join(random.sample(chave, 4) + random.choices(PALAVRAS, k=4)).capitalize())
+        conteudos.append(" ".join(random.choices(chave, k=15) + random.choices(PALAVRAS, k=100)))
+        origem.append(h if h < n_historias else -1)
+    return pd.DataFrame({
+        "titulo_limpo": titulos,
+        "link": [f"https://agenciainfra.com/blog/{palavra_rara()}-{i}/" for i in range(n)],
+        "dia": np.array([dia_final - random.randint(0, 7) for _ in range(n)], dtype=np.int32),
+    }), conteudos, origem
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--por-setor", type=int, default=80)
+    parser.add_argument("--setores", type=int, default=10)
+    parser.add_argument("--historias", type=int, default=4)
+    args = parser.parse_args()
+
+    random.seed(42)
+    semana = date(2026, 5, 1)
+    setores = {f"Setor {i}": gerar_setor(args.por_setor, args.historias, 20574) for i in range(args.setores)}
+    conteudos = {link: texto for df, textos, _ in setores.values() for link, texto in zip(df["link"], textos)}
+    boletim = BoletimSemanal()
+
+    for rodada in ("sem cache", "com cache"):
+        inicio = time.perf_counter()
+        resultado = {cat: boletim.historias(semana, cat, df, conteudos) for cat, (df, _, _) in setores.items()}
+        print(f"Boletim {args.setores} setores x {args.por_setor} notícias ({rodada}): "
+              f"{(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    # As maiores histórias encontradas devem ser as plantadas na geração
+    acertos = 0
+    for cat, (df, _, origem) in setores.items():
+        tamanhos = sorted(pd.Series(origem)[lambda s: s >= 0].value_counts().tolist(), reverse=True)
+        encontrados = [h["noticias"] for h in resultado[cat][:args.historias]]
+        acertos += encontrados == tamanhos
+    print(f"Setores com as {args.historias} histórias reencontradas: {acertos}/{args.setores}")
@@ -0,0 +1,55 @@
+"""Compara a busca antiga (pandas str.contains em título e conteúdo) com o índice invertido.
+
+Uso: python benchmarks/bench_busca.py --artigos 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indice_busca import IndiceBusca
+
+PALAVRAS = ("leilão tarifa mineração concessão ferrovia saneamento aneel porto rodovia energia solar eólica "
+            "hidrogênio licitação transmissão distribuidora água esgoto gás petróleo regulação investimento "
+            "ministério governo federal estado projeto obra contrato edital agência reguladora").split()
+
+def gerar(n, palavras_corpo=250, tamanho_vocabulario=8000):
+    """Textos com vocabulário de frequência tipo Zipf: poucas palavras comuns e uma cauda longa de raras"""
+    random.seed(42)
+    silabas = ["ba", "ca", "de", "fi", "go", "la", "me", "no", "pa", "ra", "se", "ta", "vi", "ção", "ões"]
+    vocabulario = PALAVRAS + ["".join(random.choices(silabas, k=random.randint(2, 4))) for _ in range(tamanho_vocabulario)]
+    random.shuffle(vocabulario)
+    pesos = [1 / (i + 1) for i in range(len(vocabulario))]
+    titulos = [" ".join(random.choices(vocabulario, pesos, k=8)).capitalize() for _ in range(n)]
+    conteudos = [" ".join(random.choices(vocabulario, pesos, k=palavras_corpo)) for _ in range(n)]
+    return pd.DataFrame({"titulo_limpo": titulos, "conteudo": conteudos})
+
+def cronometrar(funcao, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes): resultado = funcao()
+    return (time.perf_counter() - inicio) * 1000 / repeticoes, resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--artigos", type=int, default=20000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    df = gerar(args.artigos)
+    inicio = time.perf_counter()
+    indice = IndiceBusca.construir(df["titulo_limpo"].tolist(), df["conteudo"].tolist())
+    print(f"Construção do índice ({args.artigos} artigos): {time.perf_counter() - inicio:.2f}s")
+
+    for busca in ["ferrovia", "mineração", "mineracao", "leilão transmissão", '"energia solar"', "hidro*"]:
+        ms_pandas, qtd_pandas = cronometrar(lambda: int((
+            df["titulo_limpo"].str.contains(busca, case=False, na=False) |
+            df["conteudo"].str.contains(busca, case=False, na=False)).sum()), args.repeticoes)
+        ms_indice, ids = cronometrar(lambda: indice.buscar(busca), args.repeticoes)
+        print(f"{busca!r:24} pandas: {ms_pandas:8.1f} ms ({qtd_pandas:>6} linhas) | "
+              f"índice: {ms_indice:6.2f} ms ({len(ids):>6} linhas)")
@@ -0,0 +1,41 @@
+"""Mede a coleta concorrente contra o servidor local, variando o número de workers.
+
+Uso: python benchmarks/bench_coleta.py --workers 1 2 4 8 --latencia 0.3 --motor http
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from coleta import ColetorConcorrente
+from estado_coleta import EstadoColeta
+from motores import criar_motor
+from servidor_local import ServidorLocal
+
+
+def medir(categorias, workers, intervalo_host, motor="http", max_paginas=1):
+    coletor = ColetorConcorrente(workers=workers, intervalo_host=intervalo_host, motor=criar_motor(motor, workers),
+                                 max_paginas=max_paginas)
+    try:
+        novos = coletor.coletar(categorias, EstadoColeta())
+    finally:
+        coletor.encerrar()
+    return len(novos), coletor.metricas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--latencia", type=float, default=0.3, help="atraso simulado do servidor (s)")
+    parser.add_argument("--por-pagina", type=int, default=10)
+    parser.add_argument("--intervalo-host", type=float, default=0.0)
+    parser.add_argument("--motor", default="http", choices=["http", "selenium", "hibrido"])
+    parser.add_argument("--max-paginas", type=int, default=1, help="páginas de listagem por categoria")
+    args = parser.parse_args()
+
+    with ServidorLocal(latencia=args.latencia, por_pagina=args.por_pagina) as srv:
+        for w in args.workers:
+            qtd, m = medir(srv.categorias, w, args.intervalo_host, args.motor, args.max_paginas)
+            print(f"workers={w:<3} notícias={qtd:<5} páginas={m.paginas:<5} "
+                  f"tempo={m.tempo_total:6.2f}s  págs/s={m.paginas_por_segundo:6.2f}")
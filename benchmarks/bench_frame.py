@@ -0,0 +1,82 @@
+"""Compara o frame antigo do dashboard (tudo object, limpar_titulo com apply, recortes copiados)
+com o frame compacto de normalizacao.py: memória e tempo de preparo e de filtragem.
+
+Uso: python benchmarks/bench_frame.py --linhas 50000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from normalizacao import preparar_noticias, selecionar
+
+CATEGORIAS = ["Energia", "Transporte", "Mineração", "Saneamento", "Na Transição", "Giro", "Óleo e Gás",
+              "Telecom", "Infraestrutura", "Economia"]
+PALAVRAS = "leilão tarifa mineração concessão ferrovia saneamento aneel porto rodovia energia solar eólica".split()
+
+def gerar(n):
+    random.seed(42)
+    inicio = date(2025, 1, 1)
+    return [{
+        "data_noticia": (inicio + timedelta(days=random.randint(0, 500))).isoformat(),
+        "titulo": f"Agência iNFRA - {' '.join(random.choices(PALAVRAS, k=8)).capitalize()}",
+        "categoria": random.choice(CATEGORIAS),
+        "fonte": "Agência iNFRA",
+        "link": f"https://agenciainfra.com/blog/noticia-{i}/",
+    } for i in range(n)]
+
+def limpar_titulo(titulo):
+    """Implementação anterior, aplicada linha a linha"""
+    if not isinstance(titulo, str): return titulo
+    termos = ["Agência iNFRA", "AGÊNCIA INFRA", "Agencia iNFRA", "Agencia Infra", "iNFRA"]
+    for t in termos: titulo = titulo.replace(t, "").strip()
+    return titulo.lstrip(" -|: ")
+
+def preparar_antigo(df):
+    df['data_noticia'] = pd.to_datetime(df['data_noticia'])
+    df['titulo_limpo'] = df['titulo'].apply(limpar_titulo)
+    return df
+
+def filtrar_antigo(df, d_inicio, d_fim, setores):
+    df_f = df.copy()
+    df_f = df_f[(df_f['data_noticia'].dt.date >= d_inicio) & (df_f['data_noticia'].dt.date <= d_fim)]
+    if setores: df_f = df_f[df_f['categoria'].isin(setores)]
+    return df_f
+
+def cronometrar(funcao, repeticoes=1):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes): resultado = funcao()
+    return (time.perf_counter() - inicio) * 1000 / repeticoes, resultado
+
+def megabytes(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=50000)
+    parser.add_argument("--repeticoes", type=int, default=10)
+    args = parser.parse_args()
+
+    linhas = gerar(args.linhas)
+    ms_antigo, antigo = cronometrar(lambda: preparar_antigo(pd.DataFrame(linhas)))
+    ms_novo, novo = cronometrar(lambda: preparar_noticias(pd.DataFrame(linhas)))
+    assert antigo['titulo_limpo'].equals(novo['titulo_limpo'])
+    print(f"Preparo ({args.linhas} linhas)   antigo: {ms_antigo:8.1f} ms | novo: {ms_novo:8.1f} ms")
+    print(f"Memória do frame           antigo: {megabytes(antigo):8.1f} MB | novo: {megabytes(novo):8.1f} MB")
+
+    for d_inicio, d_fim, setores in [(date(2025, 1, 1), date(2026, 12, 31), []),
+                                     (date(2026, 1, 1), date(2026, 3, 31), []),
+                                     (date(2025, 6, 1), date(2025, 6, 30), ["Energia", "Giro"])]:
+        ms_a, df_f = cronometrar(lambda: filtrar_antigo(antigo, d_inicio, d_fim, setores), args.repeticoes)
+        ms_n, pos = cronometrar(lambda: selecionar(novo, d_inicio, d_fim, setores), args.repeticoes)
+        assert len(df_f) == len(pos)
+        print(f"Filtro {d_inicio:%d/%m/%y}-{d_fim:%d/%m/%y} {len(setores)} setores "
+              f"antigo: {ms_a:7.1f} ms ({megabytes(df_f):6.1f} MB copiados) | novo: {ms_n:6.2f} ms "
+              f"({pos.nbytes / 1e6:5.2f} MB de posições) | {len(pos)} linhas")
@@ -0,0 +1,136 @@
+"""Mede a partida a frio do dashboard: do processo novo até a primeira página do feed desenhada.
+
+Cada cenário roda num processo Python novo (nada em sys.modules) com o app.py executado pelo
+AppTest do Streamlit e o ClienteSupabaseFalso no lugar do Supabase:
+
+  - sem snapshot: a base inteira vem do banco (com a latência simulada por chamada);
+  - com snapshot: a base vem do arquivo Arrow gravado pela execução anterior e o banco é
+    consultado em segundo plano.
+
+A atualização em segundo plano a partir do snapshot (com 50 notícias novas no banco) é medida
+à parte, direto na BaseNoticias.
+
+Mede ainda o custo de importação de cada dependência pesada e confere que nenhuma delas foi
+carregada para desenhar o feed.
+
+Uso: python benchmarks/bench_inicializacao.py --linhas 20000 --latencia-supabase 0.05
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from supabase_falso import ClienteSupabaseFalso
+
+# Dependências que a página de notícias não usa (gráficos, nuvem, boletim, cliente do banco)
+MODULOS_PESADOS = ["plotly.express", "wordcloud", "matplotlib", "scipy.sparse.csgraph", "supabase"]
+
+def medir_importacao(modulo):
+    """ms para importar `modulo` num processo novo (descontado o próprio interpretador)"""
+    codigo = f"import time; t = time.perf_counter(); import {modulo}; print((time.perf_counter() - t) * 1000)"
+    saida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, cwd=RAIZ)
+    return round(float(saida.stdout.strip()), 1) if saida.returncode == 0 else None
+
+def rodar_filho(acervo, pasta, latencia, snapshot):
+    """Executa um cenário num processo novo e devolve o JSON que ele imprime"""
+    comando = [sys.executable, os.path.abspath(__file__), "--filho", "--acervo", acervo,
+               "--latencia-supabase", str(latencia)] + (["--snapshot"] if snapshot else [])
+    saida = subprocess.run(comando, capture_output=True, text=True, cwd=pasta)
+    if saida.returncode != 0: raise RuntimeError(saida.stderr[-2000:])
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+def medir_atualizacao(linhas, snapshot, latencia):
+    """ms de obter() servido do snapshot e até a atualização em segundo plano terminar"""
+    # Importados aqui: o processo filho mede a partida com sys.modules limpo
+    from cache_dados import BaseNoticias
+    from normalizacao import preparar_noticias
+    cliente = ClienteSupabaseFalso(latencia=latencia, linhas=linhas)
+    ultima = max(r["data_noticia"] for r in linhas)
+    cliente.table("noticias_infra").upsert([dict(r, data_noticia=ultima, link=f"{r['link']}nova/") for r in linhas[:50]],
+                                           on_conflict="link").execute()
+    base = BaseNoticias(cliente, preparar_noticias, arquivo_snapshot=snapshot, em_segundo_plano=True)
+    inicio = time.perf_counter()
+    base.obter()
+    leitura = time.perf_counter() - inicio
+    base.aguardar()
+    atualizacao = time.perf_counter() - inicio
+    assert base.estatisticas()["linhas_novas"] == 50
+    return round(leitura * 1000, 1), round(atualizacao * 1000, 1)
+
+def medir_inicializacao(linhas, latencia=0.05):
+    """Métricas de partida a frio com `linhas` (dicionários de noticias_infra) no banco falso"""
+    with tempfile.TemporaryDirectory() as pasta:
+        acervo = os.path.join(pasta, "acervo.jsonl")
+        with open(acervo, "w", encoding="utf-8") as f:
+            for linha in linhas:
+                f.write(json.dumps(linha, ensure_ascii=False) + "\n")
+        # A primeira execução (sem snapshot) é a que grava o arquivo usado pela segunda
+        frio = rodar_filho(acervo, pasta, latencia, snapshot=False)
+        quente = rodar_filho(acervo, pasta, latencia, snapshot=True)
+        snapshot = os.path.join(pasta, "cache_noticias.arrow")
+        tamanho_snapshot = os.path.getsize(snapshot)
+        leitura, atualizacao = medir_atualizacao(linhas, snapshot, latencia)
+    return {
+        "primeira_pagina_sem_snapshot_ms": frio["primeira_pagina_ms"],
+        "primeira_pagina_com_snapshot_ms": quente["primeira_pagina_ms"],
+        "rerun_ms": frio["rerun_ms"],
+        "leitura_snapshot_ms": leitura,
+        "atualizacao_segundo_plano_ms": atualizacao,
+        "snapshot_mb": round(tamanho_snapshot / 1e6, 2),
+        "modulos_pesados_no_feed": quente["modulos_pesados"],
+        **{f"importar_{m.replace('.', '_')}_ms": medir_importacao(m) for m in MODULOS_PESADOS},
+    }
+
+# ==============================================================================
+# PROCESSO FILHO (UM CENÁRIO)
+# ==============================================================================
+def cenario(acervo, latencia, snapshot):
+    import types
+
+    from streamlit.testing.v1 import AppTest
+
+    with open(acervo, encoding="utf-8") as f:
+        cliente = ClienteSupabaseFalso(latencia=latencia, linhas=[json.loads(l) for l in f])
+    # Módulo no lugar do pacote supabase: o custo real de importá-lo é medido à parte
+    sys.modules["supabase"] = types.SimpleNamespace(create_client=lambda *a, **k: cliente)
+    if not snapshot and os.path.exists("cache_noticias.arrow"): os.remove("cache_noticias.arrow")
+
+    app = AppTest.from_file(os.path.join(RAIZ, "app.py"), default_timeout=600)
+    app.secrets["SUPABASE_URL"] = "local"
+    app.secrets["SUPABASE_KEY"] = "local"
+    inicio = time.perf_counter()
+    app.run()
+    primeira_pagina = time.perf_counter() - inicio
+    if app.exception: raise RuntimeError(app.exception[0].message)
+    pesados = [m for m in MODULOS_PESADOS if m in sys.modules and not isinstance(sys.modules[m], types.SimpleNamespace)]
+
+    # Sem snapshot não há atualização em segundo plano concorrendo com o rerun
+    inicio = time.perf_counter()
+    app.run()
+    rerun = time.perf_counter() - inicio
+    return {"primeira_pagina_ms": round(primeira_pagina * 1000, 1), "rerun_ms": round(rerun * 1000, 1),
+            "modulos_pesados": pesados}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=20000)
+    parser.add_argument("--latencia-supabase", type=float, default=0.05, help="atraso simulado por chamada (s)")
+    parser.add_argument("--filho", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--acervo", help=argparse.SUPPRESS)
+    parser.add_argument("--snapshot", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.filho:
+        print(json.dumps(cenario(args.acervo, args.latencia_supabase, args.snapshot)))
+    else:
+        from arquivo_sintetico import gerar_arquivo
+        resultado = medir_inicializacao(gerar_arquivo(args.linhas), args.latencia_supabase)
+        for nome, valor in resultado.items():
+            print(f"{nome:38} {valor}")
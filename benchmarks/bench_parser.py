@@ -0,0 +1,37 @@
+"""Mede a extração HTML (caminho rápido) sobre as fixtures salvas e mostra quando o Selenium seria acionado.
+
+Uso: python benchmarks/bench_parser.py --repeticoes 200
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from coleta import extrair_data_limpa
+from motores import extrair_links_listagem, extrair_noticia, precisa_fallback
+from servidor_local import ler_fixture
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeticoes", type=int, default=200)
+    args = parser.parse_args()
+
+    listagem = ler_fixture("listagem_categoria.html")
+    inicio = time.perf_counter()
+    for _ in range(args.repeticoes):
+        links = extrair_links_listagem(listagem, "https://agenciainfra.com/blog/category/infraenergia/")
+    ms = (time.perf_counter() - inicio) * 1000 / args.repeticoes
+    print(f"listagem_categoria.html: {len(links)} links, {ms:.2f} ms/página")
+
+    for nome in ["noticia.html", "noticia_sem_corpo.html"]:
+        html = ler_fixture(nome)
+        inicio = time.perf_counter()
+        for _ in range(args.repeticoes):
+            noticia = extrair_noticia(html)
+        ms = (time.perf_counter() - inicio) * 1000 / args.repeticoes
+        motor = "selenium (fallback)" if precisa_fallback(noticia) else "http"
+        print(f"{nome}: data={extrair_data_limpa(noticia['data_bruta'])}, "
+              f"{len(noticia['texto'])} caracteres, {ms:.2f} ms/página -> {motor}")
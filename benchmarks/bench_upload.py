@@ -0,0 +1,60 @@
+"""Compara o envio antigo (lotes fixos de 50, sequencial) com o UploaderSupabase contra o cliente falso.
+
+Uso: python benchmarks/bench_upload.py --linhas 5000 --latencia 0.05 --taxa-falha 0.05
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from supabase_falso import ClienteSupabaseFalso
+from uploader import UploaderSupabase
+
+
+def gerar_registros(n):
+    return [{
+        "data_noticia": "2026-01-15", "fonte": "Agência iNFRA", "categoria": "Energia",
+        "titulo": f"Notícia {i}", "conteudo": "Parágrafo de teste. " * random.randint(20, 200),
+        "link": f"https://agenciainfra.com/blog/noticia-{i}/"
+    } for i in range(n)]
+
+def falhas_aleatorias(taxa, envenenados):
+    def falhar(_numero, linhas):
+        if any(l["link"] in envenenados for l in linhas): return "23502" # not_null_violation: recusa do lote
+        return random.random() < taxa
+    return falhar
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=5000)
+    parser.add_argument("--latencia", type=float, default=0.05)
+    parser.add_argument("--taxa-falha", type=float, default=0.05, help="probabilidade de falha transitória por chamada")
+    parser.add_argument("--workers", type=int, default=3)
+    args = parser.parse_args()
+
+    registros = gerar_registros(args.linhas)
+    envenenados = {registros[7]["link"]}
+
+    cliente = ClienteSupabaseFalso(args.latencia, falhas_aleatorias(args.taxa_falha, envenenados))
+    inicio = time.perf_counter()
+    perdidas = 0
+    for i in range(0, len(registros), 50):
+        try:
+            cliente.table("noticias_infra").upsert(registros[i:i + 50], on_conflict="link").execute()
+        except Exception:
+            perdidas += len(registros[i:i + 50])
+    tempo = time.perf_counter() - inicio
+    print(f"antigo (50 fixo):   {tempo:6.2f}s  {(len(registros) - perdidas) / tempo:8.1f} linhas/s  perdidas={perdidas}")
+
+    cliente = ClienteSupabaseFalso(args.latencia, falhas_aleatorias(args.taxa_falha, envenenados))
+    arquivo_falhas = os.path.join(tempfile.mkdtemp(), "falhas.jsonl")
+    uploader = UploaderSupabase(cliente, workers=args.workers, espera_base=0.05, arquivo_falhas=arquivo_falhas)
+    confirmados = uploader.enviar(registros)
+    print(f"uploader:           {uploader.metricas.tempo_total:6.2f}s  {uploader.metricas.linhas_por_segundo:8.1f} linhas/s  "
+          f"perdidas={len(registros) - len(confirmados)} (em {arquivo_falhas})")
+    print(uploader.metricas.resumo())
@@ -0,0 +1,129 @@
+"""Servidor HTTP local que imita as páginas da Agência iNFRA (listagens e notícias).
+
+Com `fixtures=True` as respostas saem das páginas salvas em benchmarks/fixtures (marcação real
+do site), com os links reescritos para o servidor local e únicos por categoria e página.
+
+Uso direto: python benchmarks/servidor_local.py --porta 8765 --latencia 0.2 [--fixtures]
+"""
+import argparse
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SLUGS = {
+    "Transporte": "infratransporte",
+    "Energia": "infraenergia",
+    "Mineração": "mineracao",
+    "Oleo_Gas": "oleo-gas",
+    "Cidades": "infra-cidades",
+    "Na Transição": "infra-transicao",
+    "Saneamento": "infrasaneamento",
+    "Giro": "giro-infra",
+    "Eventos": "infraliveventos"
+}
+
+def html_listagem(slug, por_pagina, pagina=1):
+    primeiro = (pagina - 1) * por_pagina
+    itens = "".join(
+        f'<article><h2><a href="/blog/{slug}-noticia-{i}/">Notícia {i} de {slug}</a></h2></article>'
+        for i in range(primeiro, primeiro + por_pagina)
+    )
+    return f'<html><body><a href="/blog/category/{slug}/">{slug}</a>{itens}</body></html>'
+
+PASTA_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+_LINK_NOTICIA = re.compile(r'https://agenciainfra\.com/blog/(?!category/)([\w-]+)/')
+
+def ler_fixture(nome):
+    with open(os.path.join(PASTA_FIXTURES, nome), encoding="utf-8") as f:
+        return f.read()
+
+def html_listagem_fixture(modelo, slug, pagina):
+    return _LINK_NOTICIA.sub(lambda m: f"/blog/{m.group(1)}-{slug}-{pagina}/", modelo)
+
+def html_noticia(caminho):
+    paragrafos = "".join(f"<p>Parágrafo {i} da notícia {caminho}.</p>" for i in range(8))
+    return (
+        "<html><body>"
+        f"<h1>Agência iNFRA - Notícia {caminho}</h1>"
+        '<span class="datas-noticia-inline">Publicado em 15/01/2026 às 10:00</span>'
+        f'<div class="entry-content">{paragrafos}</div>'
+        "</body></html>"
+    )
+
+
+class ServidorLocal:
+    """Sobe o servidor em thread própria; `categorias` devolve o dicionário no formato de CATEGORIAS_SITE"""
+
+    def __init__(self, porta=0, latencia=0.0, por_pagina=20, paginas=5, fixtures=False):
+        self.latencia = latencia
+        self.fixtures = fixtures
+        self._modelos = (ler_fixture("listagem_categoria.html"), ler_fixture("noticia.html")) if fixtures else None
+        self.por_pagina = por_pagina
+        self.paginas = paginas
+        self.requisicoes = 0
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                servidor.requisicoes += 1
+                if servidor.latencia: time.sleep(servidor.latencia)
+                partes = [p for p in self.path.split("/") if p]
+                if len(partes) >= 3 and partes[1] == "category":
+                    pagina = int(partes[4]) if len(partes) >= 5 and partes[3] == "page" else 1
+                    if pagina > servidor.paginas:
+                        self.send_error(404); return
+                    if servidor.fixtures:
+                        corpo = html_listagem_fixture(servidor._modelos[0], partes[2], pagina)
+                    else:
+                        corpo = html_listagem(partes[2], servidor.por_pagina, pagina)
+                elif len(partes) >= 2 and partes[0] == "blog":
+                    corpo = servidor._modelos[1] if servidor.fixtures else html_noticia(partes[1])
+                else:
+                    self.send_error(404); return
+                dados = corpo.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", porta), Handler)
+        self.porta = self.httpd.server_address[1]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base(self):
+        return f"http://127.0.0.1:{self.porta}"
+
+    @property
+    def categorias(self):
+        return {cat: f"{self.base}/blog/category/{slug}/" for cat, slug in SLUGS.items()}
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--latencia", type=float, default=0.0)
+    parser.add_argument("--por-pagina", type=int, default=20)
+    parser.add_argument("--paginas", type=int, default=5)
+    parser.add_argument("--fixtures", action="store_true", help="responde com as páginas salvas em fixtures/")
+    args = parser.parse_args()
+    with ServidorLocal(args.porta, args.latencia, args.por_pagina, args.paginas, args.fixtures) as srv:
+        print(f"Servindo em {srv.base} (Ctrl+C para sair)")
+        try:
+            while True: time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,242 @@
+"""Suíte de medições offline: coleta, histórico, sincronização e caminhos do dashboard.
+
+Tudo roda localmente: acervo sintético (arquivo_sintetico.py), páginas salvas servidas pelo
+ServidorLocal e o ClienteSupabaseFalso no lugar do Supabase. O resultado vai para um JSON
+que pode ser comparado com o de uma execução anterior.
+
+Uso: python benchmarks/suite.py --linhas 10000 --saida relatorio.json [--comparar anterior.json]
+     python benchmarks/suite.py --casos dashboard historico
+     python benchmarks/suite.py --casos inicializacao --latencia-supabase 0.05
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agregados import CuboDiario
+from armazenamento import ArmazenamentoSQLite, do_formato_planilha, exportar_excel, para_formato_planilha
+from arquivo_sintetico import gerar_arquivo
+from bench_inicializacao import medir_inicializacao
+from boletim import BoletimSemanal
+from cache_dados import BaseNoticias
+from coleta import ColetorConcorrente, extrair_data_limpa
+from consultas import COLUNAS_FEED
+from estado_coleta import EstadoColeta
+from indice_busca import IndiceBusca
+from motores import criar_motor, extrair_links_listagem, extrair_noticia
+from normalizacao import preparar_noticias, selecionar
+from servidor_local import ServidorLocal, ler_fixture
+from sincronizacao import Manifesto, sincronizar
+from supabase_falso import ClienteSupabaseFalso
+from termos import EstatisticasTermos, renderizar_nuvem
+from uploader import UploaderSupabase, montar_lotes
+
+MAX_LINHAS_EXCEL = 50_000 # Acima disso a exportação (openpyxl) domina o tempo da suíte
+MAX_DOCS_INDICE = 20_000
+
+def medir(funcao, repeticoes=3):
+    """Mediana em ms de `repeticoes` execuções, e o resultado da última"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return round(statistics.median(tempos), 3), resultado
+
+@contextlib.contextmanager
+def silencio():
+    """Esconde os prints e barras de progresso dos módulos medidos"""
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+# ==============================================================================
+# CASOS
+# ==============================================================================
+def caso_parser(acervo, args):
+    textos_data = [f"Publicado em {d['data_noticia'][8:10]}/{d['data_noticia'][5:7]}/{d['data_noticia'][:4]} às 10:00"
+                   for d in acervo[:100_000]]
+    listagem, noticia = ler_fixture("listagem_categoria.html"), ler_fixture("noticia.html")
+    ms_datas, _ = medir(lambda: [extrair_data_limpa(t) for t in textos_data])
+    ms_listagem, _ = medir(lambda: extrair_links_listagem(listagem, "https://agenciainfra.com/blog/category/infraenergia/"), 20)
+    ms_noticia, _ = medir(lambda: extrair_noticia(noticia), 20)
+
+    # Coleta completa contra as páginas salvas, com latência de rede simulada
+    with ServidorLocal(latencia=0.02, paginas=2, fixtures=True) as srv, silencio():
+        coletor = ColetorConcorrente(workers=4, intervalo_host=0.0, motor=criar_motor("http", 4), max_paginas=2)
+        try:
+            novos = coletor.coletar(srv.categorias, EstadoColeta())
+        finally:
+            coletor.encerrar()
+    return {
+        "extrair_data_limpa_us": round(ms_datas * 1000 / len(textos_data), 3),
+        "listagem_ms": ms_listagem,
+        "noticia_ms": ms_noticia,
+        "coleta_noticias": len(novos),
+        "coleta_paginas_por_s": round(coletor.metricas.paginas_por_segundo, 1),
+    }
+
+def caso_historico(acervo, args):
+    planilha = para_formato_planilha(pd.DataFrame(acervo))
+    with tempfile.TemporaryDirectory() as pasta:
+        armazenamento = ArmazenamentoSQLite(os.path.join(pasta, "historico.db"))
+        try:
+            ms_converter, linhas = medir(lambda: do_formato_planilha(planilha), 1)
+            ms_inserir, qtd = medir(lambda: armazenamento.inserir(linhas), 1)
+            ms_ler, _ = medir(lambda: armazenamento.ler())
+            ms_reinserir, repetidas = medir(lambda: armazenamento.inserir(linhas), 1)
+            ms_excel = None
+            if len(acervo) <= MAX_LINHAS_EXCEL:
+                ms_excel, _ = medir(lambda: exportar_excel(armazenamento, os.path.join(pasta, "historico.xlsx")), 1)
+        finally:
+            armazenamento.fechar()
+    assert qtd == len(acervo) and repetidas == 0
+    return {"converter_ms": ms_converter, "inserir_ms": ms_inserir, "ler_ms": ms_ler,
+            "reinserir_ms": ms_reinserir, "exportar_excel_ms": ms_excel}
+
+def caso_upload(acervo, args):
+    ms_lotes, lotes = medir(lambda: montar_lotes(acervo))
+    with tempfile.TemporaryDirectory() as pasta, silencio():
+        cliente = ClienteSupabaseFalso(latencia=args.latencia_supabase)
+        uploader = UploaderSupabase(cliente, workers=3, espera_base=0.0,
+                                    arquivo_falhas=os.path.join(pasta, "falhas.jsonl"))
+        manifesto = Manifesto(os.path.join(pasta, "manifesto.json"))
+        ms_envio, relatorio = medir(lambda: sincronizar(acervo, manifesto, uploader.enviar), 1)
+        # Segunda rodada: nada mudou, só o cálculo do delta
+        ms_delta, sem_mudanca = medir(lambda: sincronizar(acervo, manifesto, uploader.enviar), 1)
+    return {
+        "montar_lotes_ms": ms_lotes,
+        "lotes": len(lotes),
+        "sincronizar_ms": ms_envio,
+        "linhas_por_s": round(len(acervo) / (ms_envio / 1000), 1),
+        "latencia_p95_ms": round(uploader.metricas.percentil(95) * 1000, 2),
+        "delta_sem_mudanca_ms": ms_delta,
+        "enviados": relatorio["enviados"],
+        "reenviados_sem_mudanca": sem_mudanca["enviados"],
+    }
+
+def caso_dashboard(acervo, args):
+    linhas_feed = [{c: r[c] for c in COLUNAS_FEED} for r in acervo]
+    ms_preparo, df = medir(lambda: preparar_noticias(pd.DataFrame(linhas_feed, columns=COLUNAS_FEED)))
+    fim = df["data_noticia"].max().date()
+    recortes = [(date(2025, 1, 1), fim, ()), (fim - timedelta(days=90), fim, ()),
+                (fim - timedelta(days=30), fim, ("Energia", "Giro"))]
+    ms_filtros, _ = medir(lambda: [selecionar(df, *r) for r in recortes], 10)
+    posicoes = selecionar(df, *recortes[1])
+
+    ms_cubo, cubo = medir(lambda: CuboDiario.construir(df))
+    ms_painel, _ = medir(lambda: [(c.total, c.setor_destaque(), c.ultima_data(), c.serie_geral(), c.por_categoria())
+                                  for c in [cubo.fatiar(*r) for r in recortes]], 10)
+    ms_termos, termos = medir(lambda: EstatisticasTermos.construir(df["titulo_limpo"].tolist()), 1)
+    ms_frequencias, freq = medir(lambda: termos.frequencias(posicoes), 10)
+    ms_nuvem, _ = medir(lambda: renderizar_nuvem(freq), 1)
+
+    amostra = acervo[:MAX_DOCS_INDICE]
+    ms_indice, indice = medir(lambda: IndiceBusca.construir([r["titulo"] for r in amostra],
+                                                            [r["conteudo"] for r in amostra]), 1)
+    ms_busca, _ = medir(lambda: [indice.buscar(b) for b in ["ferrovia", "leilão transmissão", '"energia solar"', "hidro*"]], 10)
+
+    semana = df.iloc[selecionar(df, fim - timedelta(days=7), fim)]
+    conteudos = {r["link"]: r["conteudo"] for r in acervo if r["data_noticia"] >= (fim - timedelta(days=7)).isoformat()}
+    ms_boletim, _ = medir(lambda: [BoletimSemanal().historias(fim, cat, grupo, conteudos)
+                                   for cat, grupo in semana.groupby("categoria", observed=True)], 1)
+
+    # Base em memória do app: carga completa e uma verificação incremental com 50 notícias novas
+    cliente = ClienteSupabaseFalso(linhas=acervo[50:])
+    relogio = [0.0]
+    base = BaseNoticias(cliente, preparar_noticias, relogio=lambda: relogio[0])
+    ms_carga, _ = medir(base.obter, 1)
+    cliente.table("noticias_infra").upsert([dict(r, data_noticia=fim.isoformat()) for r in acervo[:50]],
+                                           on_conflict="link").execute()
+    relogio[0] = base.intervalo
+    ms_incremento, _ = medir(base.obter, 1)
+    assert base.estatisticas()["linhas_novas"] == 50
+    return {
+        "preparar_ms": ms_preparo,
+        "filtros_ms": ms_filtros,
+        "cubo_ms": ms_cubo,
+        "painel_kpis_ms": ms_painel,
+        "termos_ms": ms_termos,
+        "frequencias_ms": ms_frequencias,
+        "nuvem_ms": ms_nuvem,
+        "indice_docs": len(amostra),
+        "indice_ms": ms_indice,
+        "busca_ms": ms_busca,
+        "boletim_ms": ms_boletim,
+        "carga_completa_ms": ms_carga,
+        "verificacao_incremental_ms": ms_incremento,
+        "memoria_frame_mb": round(float(df.memory_usage(deep=True).sum()) / 1e6, 2),
+    }
+
+def caso_inicializacao(acervo, args):
+    # Processos novos para cada medição: a partida a frio não se repete dentro deste processo
+    return medir_inicializacao(acervo, args.latencia_supabase)
+
+CASOS = {"parser": caso_parser, "historico": caso_historico, "upload": caso_upload, "dashboard": caso_dashboard,
+         "inicializacao": caso_inicializacao}
+
+# ==============================================================================
+# RELATÓRIO
+# ==============================================================================
+def versao_git():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def comparar(atual, anterior):
+    """Imprime métrica a métrica a variação em relação ao relatório anterior"""
+    print(f"\nComparação com {anterior.get('gerado_em')} ({anterior.get('commit')}):")
+    for caso, metricas in atual["casos"].items():
+        for nome, valor in metricas.items():
+            antigo = anterior.get("casos", {}).get(caso, {}).get(nome)
+            if not isinstance(valor, (int, float)) or not isinstance(antigo, (int, float)) or not antigo: continue
+            variacao = (valor - antigo) / antigo * 100
+            print(f"  {caso}.{nome:28} {antigo:>12} -> {valor:>12}  ({variacao:+.1f}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=10000, help="tamanho do acervo sintético (10 mil a 500 mil)")
+    parser.add_argument("--casos", nargs="+", default=list(CASOS), choices=list(CASOS))
+    parser.add_argument("--latencia-supabase", type=float, default=0.0, help="atraso simulado por chamada (s)")
+    parser.add_argument("--saida", default="relatorio_bench.json")
+    parser.add_argument("--comparar", metavar="RELATORIO", help="relatório anterior para comparação")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    acervo = gerar_arquivo(args.linhas)
+    print(f"📦 Acervo sintético: {len(acervo)} notícias ({time.perf_counter() - inicio:.1f}s)")
+
+    relatorio = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "commit": versao_git(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": {"linhas": args.linhas, "latencia_supabase": args.latencia_supabase},
+        "casos": {},
+    }
+    for nome in args.casos:
+        inicio = time.perf_counter()
+        relatorio["casos"][nome] = CASOS[nome](acervo, args)
+        print(f"⏱️ {nome}: {time.perf_counter() - inicio:.1f}s -> {relatorio['casos'][nome]}")
+
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"✅ Relatório gravado em {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            comparar(relatorio, json.load(f))
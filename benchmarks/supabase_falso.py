@@ -0,0 +1,137 @@
+"""Substituto local do cliente Supabase (supabase.create_client) para medições sem rede.
+
+Imita as cadeias usadas no projeto, guardando as linhas em memória:
+`table(t).upsert(linhas, on_conflict=...).execute()` e
+`table(t).select(...).gte/lt/lte/gt/eq/in_/order/range/limit(...).execute()`,
+com latência simulada e falhas injetáveis.
+"""
+import threading
+import time
+
+
+class ErroSupabaseFalso(Exception):
+    """Como o APIError do postgrest: `code` é o SQLSTATE, o código do PostgREST ou o status HTTP"""
+
+    def __init__(self, mensagem, code=None):
+        super().__init__(mensagem)
+        self.code = code
+
+
+class _Resposta:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Consulta:
+    def __init__(self, cliente, tabela):
+        self.cliente = cliente
+        self.tabela = tabela
+        self._operacao = None
+        self._linhas = None
+        self._chave = None
+        self._colunas = None
+        self._filtros = []
+        self._ordem = []
+        self._inicio, self._fim = 0, None
+
+    # --- escrita ---
+    def upsert(self, linhas, on_conflict="id"):
+        self._operacao, self._linhas, self._chave = "upsert", list(linhas), on_conflict
+        return self
+
+    # --- leitura ---
+    def select(self, *colunas):
+        self._operacao = "select"
+        self._colunas = None if colunas in ((), ("*",)) else [c for col in colunas for c in col.split(",")]
+        return self
+
+    def _filtro(self, funcao):
+        self._filtros.append(funcao)
+        return self
+
+    def gte(self, coluna, valor): return self._filtro(lambda r: r.get(coluna) is not None and r[coluna] >= valor)
+    def gt(self, coluna, valor): return self._filtro(lambda r: r.get(coluna) is not None and r[coluna] > valor)
+    def lte(self, coluna, valor): return self._filtro(lambda r: r.get(coluna) is not None and r[coluna] <= valor)
+    def lt(self, coluna, valor): return self._filtro(lambda r: r.get(coluna) is not None and r[coluna] < valor)
+    def eq(self, coluna, valor): return self._filtro(lambda r: r.get(coluna) == valor)
+
+    def in_(self, coluna, valores):
+        valores = set(valores)
+        return self._filtro(lambda r: r.get(coluna) in valores)
+
+    def order(self, coluna, desc=False):
+        self._ordem.append((coluna, desc))
+        return self
+
+    def range(self, inicio, fim):
+        self._inicio, self._fim = inicio, fim
+        return self
+
+    def limit(self, tamanho):
+        self._fim = self._inicio + tamanho - 1
+        return self
+
+    def _ordenar(self, linhas):
+        for coluna, desc in reversed(self._ordem):
+            linhas.sort(key=lambda r: (r.get(coluna) is None, r.get(coluna) or ""), reverse=desc)
+        return linhas
+
+    def _selecionar(self):
+        cliente = self.cliente
+        tabela = cliente.tabelas.get(self.tabela, {})
+        if self._filtros:
+            linhas = self._ordenar([r for r in tabela.values() if all(f(r) for f in self._filtros)])
+        else:
+            # Leitura em faixas da tabela inteira: a ordenação é refeita só quando a tabela muda
+            chave = (self.tabela, tuple(self._ordem))
+            versao, linhas = cliente._ordenadas.get(chave, (None, None))
+            if versao != cliente.versao:
+                linhas = self._ordenar(list(tabela.values()))
+                cliente._ordenadas[chave] = (cliente.versao, linhas)
+        fim = None if self._fim is None else self._fim + 1
+        linhas = linhas[self._inicio:fim]
+        if self._colunas: linhas = [{c: r.get(c) for c in self._colunas} for r in linhas]
+        return _Resposta([dict(r) for r in linhas])
+
+    def execute(self):
+        cliente = self.cliente
+        if cliente.latencia: time.sleep(cliente.latencia)
+        with cliente._lock:
+            cliente.chamadas += 1
+            numero = cliente.chamadas
+        falha = cliente.falhar(numero, self._linhas or []) if cliente.falhar else None
+        if falha:
+            codigo = 503 if falha is True else falha
+            raise ErroSupabaseFalso(f"falha simulada na chamada {numero}", codigo)
+        if self._operacao == "upsert":
+            with cliente._lock:
+                dados = cliente.tabelas.setdefault(self.tabela, {})
+                for linha in self._linhas:
+                    dados[linha[self._chave]] = dict(linha)
+                cliente.versao += 1
+                cliente.linhas_enviadas += len(self._linhas)
+            return _Resposta(self._linhas)
+        if self._operacao == "select":
+            with cliente._lock:
+                return self._selecionar()
+        raise ErroSupabaseFalso(f"operação não suportada: {self._operacao}")
+
+
+class ClienteSupabaseFalso:
+    """`falhar(numero_da_chamada, linhas)` -> True faz a chamada levantar ErroSupabaseFalso como
+    indisponibilidade (503); um código (ex.: "23502") simula a recusa do conteúdo do lote"""
+
+    def __init__(self, latencia=0.0, falhar=None, linhas=None, tabela="noticias_infra", chave="link"):
+        self.latencia = latencia
+        self.falhar = falhar
+        self.tabelas = {}
+        self.chamadas = 0
+        self.linhas_enviadas = 0
+        self.versao = 0 # Muda a cada upsert (alterações feitas direto em `tabelas` não são vistas pelo cache de ordenação)
+        self._ordenadas = {}
+        self._lock = threading.Lock()
+        if linhas:
+            self.tabelas[tabela] = {r[chave]: dict(r) for r in linhas}
+
+    def table(self, nome):
+        return _Consulta(self, nome)
@@ -0,0 +1,94 @@
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from indice_busca import normalizar, tokenizar
+from termos import IGNORAR, CacheLRU
+
+LIMIAR_SIMILARIDADE = 0.35 # Cosseno mínimo para duas notícias contarem como a mesma história
+PESO_TITULO = 2 # O título define o assunto mais que o corpo
+MAX_TERMOS_CORPO = 120 # Só o início do texto (lide): o resto costuma repetir contexto genérico
+_IGNORAR = {normalizar(p) for p in IGNORAR}
+
+
+def _termos_documento(titulo, conteudo):
+    # O corte do texto antes de tokenizar evita processar o corpo inteiro só para descartá-lo
+    corpo = conteudo[:MAX_TERMOS_CORPO * 12] if conteudo else ""
+    termos = tokenizar(titulo) * PESO_TITULO + tokenizar(corpo)[:MAX_TERMOS_CORPO]
+    return [t for t in termos if len(t) > 2 and not t.isdigit() and t not in _IGNORAR]
+
+def vetorizar(titulos, conteudos):
+    """Matriz TF-IDF esparsa (uma linha por notícia, normalizada), com tf sublinear"""
+    vocabulario, linhas, colunas = {}, [], []
+    for doc, (titulo, conteudo) in enumerate(zip(titulos, conteudos)):
+        for termo in _termos_documento(titulo, conteudo):
+            linhas.append(doc)
+            colunas.append(vocabulario.setdefault(termo, len(vocabulario)))
+    n_docs = len(titulos)
+    # COO -> CSR soma as repetições de (doc, termo): a contagem de cada termo no documento
+    tf = sparse.csr_matrix((np.ones(len(linhas), dtype=np.float32), (linhas, colunas)),
+                           shape=(n_docs, len(vocabulario)))
+    tf.sum_duplicates()
+    tf.data = 1 + np.log(tf.data)
+    df = np.bincount(tf.indices, minlength=len(vocabulario))
+    # Sem o "+1" do idf suavizado: termo presente em todas as notícias da semana não aproxima nenhuma delas
+    idf = np.log((1 + n_docs) / (1 + df)).astype(np.float32)
+    matriz = tf @ sparse.diags(idf)
+    normas = np.sqrt(np.asarray(matriz.multiply(matriz).sum(axis=1)).ravel())
+    normas[normas == 0] = 1
+    return sparse.diags(1 / normas) @ matriz
+
+def agrupar(matriz, limiar=LIMIAR_SIMILARIDADE):
+    """Rótulo de história por notícia: componentes conexas do grafo de similaridade >= limiar"""
+    similaridade = (matriz @ matriz.T).tocsr()
+    similaridade.data[similaridade.data < limiar] = 0
+    similaridade.eliminate_zeros()
+    _, rotulos = connected_components(similaridade, directed=False)
+    return rotulos
+
+def historias(titulos, conteudos, links, dias, limiar=LIMIAR_SIMILARIDADE):
+    """Histórias da semana, da maior (e mais recente no empate) para a menor.
+
+    Cada uma traz a manchete representativa (a notícia mais próxima do centro do grupo),
+    o link dela, a quantidade de notícias e o dia (ordinal) da mais recente.
+    """
+    if not len(titulos): return []
+    matriz = vetorizar(titulos, conteudos)
+    rotulos = agrupar(matriz, limiar)
+    dias = np.asarray(dias)
+    n_historias = rotulos.max() + 1
+    # Centro de cada história (soma dos vetores) e a proximidade de cada notícia ao centro da sua
+    pertence = sparse.csr_matrix((np.ones(len(rotulos), dtype=np.float32), (rotulos, np.arange(len(rotulos)))),
+                                 shape=(n_historias, len(rotulos)))
+    centros = (pertence @ matriz).tocsr()
+    proximidade = np.asarray(matriz.multiply(centros[rotulos]).sum(axis=1)).ravel()
+    # Primeira linha de cada história na ordem (história, mais próxima do centro, mais recente)
+    ordem = np.lexsort((-dias, -proximidade, rotulos))
+    escolhidos = ordem[np.flatnonzero(np.r_[True, np.diff(rotulos[ordem]) != 0])]
+    tamanhos = np.bincount(rotulos, minlength=n_historias)
+    ultimo_dia = np.full(n_historias, np.iinfo(np.int64).min)
+    np.maximum.at(ultimo_dia, rotulos, dias.astype(np.int64))
+
+    resultado = [{
+        "titulo": titulos[e],
+        "link": links[e],
+        "noticias": int(tamanhos[r]),
+        "ultimo_dia": int(ultimo_dia[r]),
+    } for r, e in enumerate(escolhidos)]
+    resultado.sort(key=lambda h: (-h["noticias"], -h["ultimo_dia"]))
+    return resultado
+
+
+class BoletimSemanal:
+    """Histórias por (semana, categoria), calculadas uma vez para cada versão dos dados"""
+
+    def __init__(self, tamanho_cache=128):
+        self.cache = CacheLRU(tamanho_cache)
+
+    def historias(self, semana, categoria, df_cat, conteudos):
+        """`df_cat`: notícias da categoria na semana; `conteudos`: {link: texto} (links ausentes usam só o título)"""
+        def calcular():
+            links = df_cat['link'].tolist()
+            return historias(df_cat['titulo_limpo'].fillna("").tolist(), [conteudos.get(l, "") for l in links],
+                             links, df_cat['dia'].to_numpy())
+        return self.cache.obter((semana, categoria), calcular)
@@ -0,0 +1,293 @@
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from consultas import COLUNAS_FEED, buscar_todos
+from indice_busca import IndiceBusca
+from normalizacao import concatenar
+
+INTERVALO_VERIFICACAO = 300 # Segundos entre consultas por notícias novas
+INTERVALO_RECARGA_COMPLETA = 6 * 3600 # Releitura total: pega edições e exclusões que o incremento não vê
+ARQUIVO_SNAPSHOT = "cache_noticias.arrow" # Última base conhecida, lida na partida a frio
+
+
+# ==============================================================================
+# SNAPSHOT EM DISCO
+# ==============================================================================
+_CHAVE_RECARGA = b"infra.recarga_completa" # Metadado do schema: epoch da última releitura total do banco
+
+def salvar_snapshot(df, caminho, recarga_completa):
+    """Grava o frame preparado em Arrow IPC sem compressão: a leitura mapeia o arquivo, sem descompactar"""
+    import pyarrow as pa
+    from pyarrow import feather
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    if recarga_completa is not None:
+        tabela = tabela.replace_schema_metadata({**(tabela.schema.metadata or {}),
+                                                 _CHAVE_RECARGA: repr(recarga_completa).encode()})
+    # Grava ao lado e troca de uma vez: quem lê nunca encontra um arquivo pela metade
+    temporario = f"{caminho}.tmp"
+    feather.write_feather(tabela, temporario, compression="uncompressed")
+    os.replace(temporario, caminho)
+
+def ler_snapshot(caminho):
+    """(frame, epoch da última recarga completa) gravados por salvar_snapshot, ou (None, None) se não houver.
+
+    Categorias e tipos são preservados; snapshot sem a data da recarga devolve None no lugar dela.
+    """
+    if not os.path.exists(caminho): return None, None
+    from pyarrow import feather
+    tabela = feather.read_table(caminho, memory_map=True)
+    recarga = (tabela.schema.metadata or {}).get(_CHAVE_RECARGA)
+    return tabela.to_pandas(), float(recarga) if recarga else None
+
+
+class BaseNoticias:
+    """Frame dos painéis mantido em memória entre reruns e sessões, atualizado por incremento.
+
+    A cada `intervalo` segundos só são lidas as linhas com data_noticia >= maior data já carregada
+    (o último dia é relido e as repetidas são descartadas pelo link); apenas essas passam por
+    `preparar`. Estruturas derivadas (cubo, termos) são refeitas só quando o frame muda, e o índice
+    de busca recebe apenas os documentos novos.
+
+    Com `arquivo_snapshot`, a primeira leitura vem do disco (a última base gravada) e cada
+    atualização regrava o arquivo. Com `em_segundo_plano`, consultas ao banco rodam numa thread
+    e `obter()` devolve na hora o frame que já existe; só a primeira carga sem snapshot espera.
+    `conectar` cria o cliente apenas quando o banco é consultado pela primeira vez.
+    """
+
+    def __init__(self, cliente=None, preparar=None, colunas=COLUNAS_FEED, intervalo=INTERVALO_VERIFICACAO,
+                 intervalo_completo=INTERVALO_RECARGA_COMPLETA, relogio=time.monotonic, conectar=None,
+                 arquivo_snapshot=None, em_segundo_plano=False):
+        self._cliente = cliente
+        self._conectar = conectar
+        self.preparar = preparar
+        self.colunas = list(colunas)
+        self.intervalo = intervalo
+        self.intervalo_completo = intervalo_completo
+        self.relogio = relogio
+        self.arquivo_snapshot = arquivo_snapshot
+        self.em_segundo_plano = em_segundo_plano
+        self.df = None
+        self.versao = 0
+        self._links = set()
+        self._verificado_em = self._recarregado_em = None
+        self._recarga_completa = None # Epoch (relógio de parede) da última recarga completa, gravado no snapshot
+        self._derivados = {}
+        self._indice = None # (indice, links na ordem dos ids, set de links), montado na primeira busca
+        self._lock = threading.RLock()
+        self._lock_indice = threading.Lock() # Uma montagem do índice por vez, sem travar obter()
+        self._thread = None # Atualização em segundo plano em andamento
+
+        # Contadores: acerto = frame servido da memória; falta = foi preciso consultar o banco
+        self.acertos = 0
+        self.faltas = 0
+        self.atualizacoes = 0 # Consultas incrementais que trouxeram notícias novas
+        self.recargas_completas = 0
+        self.linhas_novas = 0
+        self.reconstrucoes = 0 # Estruturas derivadas refeitas
+        self.duracoes = deque(maxlen=100) # Segundos gastos em cada consulta ao banco
+        self.do_snapshot = False # Frame atual veio do disco e ainda não foi conferido com o banco
+        self.falhas = 0 # Atualizações em segundo plano que terminaram em erro
+        self.desatualizada = False # A última atualização em segundo plano falhou (o frame pode estar velho)
+
+    @property
+    def cliente(self):
+        if self._cliente is None: self._cliente = self._conectar()
+        return self._cliente
+
+    # ==========================================================================
+    # LEITURA DO BANCO
+    # ==========================================================================
+    def _montar(self, linhas, colunas):
+        df = pd.DataFrame(linhas, columns=colunas).drop_duplicates("link", ignore_index=True)
+        return self.preparar(df)
+
+    def _recarregar(self, agora):
+        # A consulta corre fora do lock: com a atualização em segundo plano, as sessões seguem lendo o frame atual
+        df = self._montar(buscar_todos(self.cliente, self.colunas), self.colunas)
+        with self._lock:
+            self._links = set(df["link"])
+            self._indice = None # Remontado na próxima busca, já sobre a base relida
+            self._trocar(df)
+            self._recarregado_em = self._verificado_em = agora
+            self._recarga_completa = time.time()
+            self.do_snapshot = False
+            self.recargas_completas += 1
+        self._gravar(df)
+
+    def _incrementar(self, agora):
+        with self._lock:
+            atual = self.df
+            com_indice = self._indice is not None
+        ultima = atual["data_noticia"].max()
+        if pd.isna(ultima): return self._recarregar(agora)
+        # Com o índice montado, o conteúdo das novas já vem junto para estendê-lo
+        colunas = self.colunas + (["conteudo"] if com_indice else [])
+        linhas = buscar_todos(self.cliente, colunas, desde=ultima.date())
+
+        with self._lock:
+            self._verificado_em = agora
+            self.do_snapshot = False
+            linhas = [r for r in linhas if r["link"] not in self._links]
+            if not linhas: return
+            novas = self._montar(linhas, colunas)
+            if self._indice is not None:
+                # Índice montado durante a consulta: as novas vieram sem conteúdo, ele é refeito na próxima busca
+                if com_indice: self._estender_indice(novas)
+                else: self._indice = None
+            # Mesma ordem do banco (data desc, link); sem data fica no topo, como o NULLS FIRST do Postgres
+            df = concatenar(self.df, novas)
+            df = df.sort_values(["data_noticia", "link"], ascending=[False, True], na_position="first",
+                                kind="stable", ignore_index=True)
+            self._links.update(novas["link"])
+            self._trocar(df)
+            self.atualizacoes += 1
+            self.linhas_novas += len(novas)
+        self._gravar(df)
+
+    def _carregar_snapshot(self, agora):
+        try:
+            df, recarga = ler_snapshot(self.arquivo_snapshot)
+        except Exception as e:
+            print(f"⚠️ Snapshot {self.arquivo_snapshot} ilegível, lendo do banco: {e}")
+            return
+        if df is None: return
+        self._links = set(df["link"])
+        self._trocar(df)
+        self.do_snapshot = True
+        # A recarga completa conta a partir de quando o snapshot a fez, não da partida: com reinícios
+        # frequentes ela ainda vence e traz edições e exclusões. Sem a data, vence na hora.
+        idade = time.time() - recarga if recarga else self.intervalo_completo
+        self._recarga_completa = recarga
+        self._recarregado_em = agora - max(0.0, idade)
+        # O que chegou depois da gravação é buscado logo em seguida
+        self._verificado_em = agora - self.intervalo
+
+    def _gravar(self, df):
+        if not self.arquivo_snapshot: return
+        try:
+            salvar_snapshot(df, self.arquivo_snapshot, self._recarga_completa)
+        except Exception as e:
+            print(f"⚠️ Não foi possível gravar o snapshot {self.arquivo_snapshot}: {e}")
+
+    def _trocar(self, df):
+        # O frame nunca é alterado no lugar: sessões que já o leram continuam com uma versão coerente
+        self.df = df
+        self.versao += 1
+
+    def _medir(self, funcao):
+        inicio = time.perf_counter()
+        try:
+            funcao(self.relogio())
+        finally:
+            with self._lock:
+                self.duracoes.append(time.perf_counter() - inicio)
+                self.faltas += 1
+
+    def _atualizar_em_segundo_plano(self, funcao):
+        try:
+            self._medir(funcao)
+        except Exception as e:
+            # O frame anterior continua servindo; nova tentativa quando o intervalo vencer de novo
+            with self._lock:
+                self._verificado_em = self.relogio()
+                self.falhas += 1
+                self.desatualizada = True
+            print(f"⚠️ Falha ao atualizar a base de notícias: {e}")
+        else:
+            self.desatualizada = False
+
+    # ==========================================================================
+    # INTERFACE PARA O APP
+    # ==========================================================================
+    def obter(self):
+        """Frame atual; consulta o banco só quando o intervalo venceu"""
+        with self._lock:
+            agora = self.relogio()
+            if self.df is None and self.arquivo_snapshot: self._carregar_snapshot(agora)
+            if self.df is None or agora - self._recarregado_em >= self.intervalo_completo:
+                funcao = self._recarregar
+            elif agora - self._verificado_em >= self.intervalo:
+                funcao = self._incrementar
+            else:
+                funcao = None
+            atualizando = self._thread is not None and self._thread.is_alive()
+            if funcao is None or atualizando or (self.df is not None and self.em_segundo_plano):
+                if funcao is not None and not atualizando:
+                    self._thread = threading.Thread(target=self._atualizar_em_segundo_plano, args=(funcao,),
+                                                    name="atualizacao-noticias", daemon=True)
+                    self._thread.start()
+                self.acertos += 1
+                return self.df
+            self._medir(funcao)
+            return self.df
+
+    def aguardar(self, timeout=None):
+        """Espera a atualização em segundo plano em andamento (se houver) terminar"""
+        thread = self._thread
+        if thread is not None: thread.join(timeout)
+
+    def derivado(self, nome, df, construir):
+        """construir(df), guardado enquanto `df` for o mesmo frame (refeito só quando os dados mudam)"""
+        with self._lock:
+            atual = self._derivados.get(nome)
+            if atual is not None and atual[0] is df: return atual[1]
+        valor = construir(df)
+        with self._lock:
+            self._derivados[nome] = (df, valor)
+            self.reconstrucoes += 1
+        return valor
+
+    def indice(self):
+        """(índice de busca, links na ordem dos ids do índice)"""
+        with self._lock:
+            if self._indice is not None: return self._indice[:2]
+        # Leitura e montagem fora do lock principal: as outras sessões seguem em obter() enquanto isso
+        with self._lock_indice:
+            with self._lock:
+                if self._indice is not None: return self._indice[:2] # Montado por outra sessão
+                versao = self.versao
+            inicio = time.perf_counter()
+            linhas = buscar_todos(self.cliente, ["titulo", "conteudo", "link"])
+            indice = IndiceBusca.construir([r["titulo"] for r in linhas], [r["conteudo"] for r in linhas])
+            links = np.array([r["link"] for r in linhas], dtype=object)
+            montado = (indice, links, set(links))
+            with self._lock:
+                self.duracoes.append(time.perf_counter() - inicio)
+                self.reconstrucoes += 1
+                # Base trocada durante a montagem (sem estender o índice): serve esta busca, mas não fica guardado
+                if self.versao == versao: self._indice = montado
+            return montado[:2]
+
+    def _estender_indice(self, novas):
+        indice, links, conhecidos = self._indice
+        # A leitura do índice pode ter sido posterior à do frame: não indexa o mesmo link duas vezes
+        novas = novas[~novas["link"].isin(conhecidos)]
+        if novas.empty: return
+        indice = indice.acrescentar(novas["titulo"].tolist(), novas["conteudo"].tolist())
+        links = np.concatenate([links, novas["link"].to_numpy(dtype=object)])
+        self._indice = (indice, links, conhecidos | set(novas["link"]))
+        self.reconstrucoes += 1
+
+    def estatisticas(self):
+        with self._lock:
+            duracoes = list(self.duracoes)
+            return {
+                "versao": self.versao,
+                "linhas": 0 if self.df is None else len(self.df),
+                "acertos": self.acertos,
+                "faltas": self.faltas,
+                "atualizacoes": self.atualizacoes,
+                "recargas_completas": self.recargas_completas,
+                "linhas_novas": self.linhas_novas,
+                "reconstrucoes": self.reconstrucoes,
+                "do_snapshot": self.do_snapshot,
+                "falhas": self.falhas,
+                "desatualizada": self.desatualizada,
+                "ultima_duracao_ms": round(duracoes[-1] * 1000, 1) if duracoes else None,
+                "duracao_media_ms": round(sum(duracoes) / len(duracoes) * 1000, 1) if duracoes else None,
+            }
@@ -0,0 +1,171 @@
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+
+from motores import criar_motor
+from telemetria import span
+
+# ==============================================================================
+# UTILITÁRIOS
+# ==============================================================================
+def extrair_data_limpa(texto):
+    match = re.search(r'(\d{2}/\d{2}/\d{4})', str(texto))
+    return match.group(1) if match else "S/D"
+
+def link_de_noticia(link):
+    """Filtro de segurança para pegar apenas notícias reais"""
+    return "/blog/" in link and "/category/" not in link
+
+def url_pagina(url_cat, n):
+    """URL da n-ésima página da listagem da categoria (/page/N/)"""
+    return url_cat if n <= 1 else f"{url_cat.rstrip('/')}/page/{n}/"
+
+def montar_registro(noticia, link, categoria):
+    return {
+        "Data": extrair_data_limpa(noticia["data_bruta"]),
+        "Título": noticia["titulo"] or "Título não localizado",
+        "Link": link,
+        "Categoria": categoria,
+        "Fonte": "Agência iNFRA",
+        "Conteúdo": noticia["texto"] or "Texto não extraído"
+    }
+
+# ==============================================================================
+# CONTROLE DE RITMO E MÉTRICAS
+# ==============================================================================
+class LimitadorPorHost:
+    """Garante um intervalo mínimo entre requisições ao mesmo host, compartilhado entre os workers"""
+
+    def __init__(self, intervalo=1.0):
+        self.intervalo = intervalo
+        self._proximo = {}
+        self._lock = threading.Lock()
+
+    def aguardar(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            agora = time.monotonic()
+            horario = max(agora, self._proximo.get(host, 0.0))
+            self._proximo[host] = horario + self.intervalo
+        if horario > agora:
+            time.sleep(horario - agora)
+
+
+class MetricasColeta:
+    def __init__(self):
+        self.paginas = 0
+        self.erros = 0
+        self.inicio = None # Marcado pelo primeiro coletar(), não na criação do coletor
+        self.fim = None
+        self._lock = threading.Lock()
+
+    def registrar_pagina(self):
+        with self._lock: self.paginas += 1
+
+    def registrar_erro(self):
+        with self._lock: self.erros += 1
+
+    def iniciar(self):
+        if self.inicio is None: self.inicio = time.perf_counter()
+
+    def finalizar(self):
+        self.fim = time.perf_counter()
+
+    @property
+    def tempo_total(self):
+        if self.inicio is None: return 0.0
+        return (self.fim or time.perf_counter()) - self.inicio
+
+    @property
+    def paginas_por_segundo(self):
+        return self.paginas / self.tempo_total if self.tempo_total > 0 else 0.0
+
+    def resumo(self):
+        return (f"⏱️ {self.paginas} páginas em {self.tempo_total:.1f}s "
+                f"({self.paginas_por_segundo:.2f} págs/s, {self.erros} erros)")
+
+# ==============================================================================
+# COLETOR CONCORRENTE
+# ==============================================================================
+class ColetorConcorrente:
+    """Busca listagens e notícias com um pool limitado de workers sobre um motor plugável (ver motores.py)"""
+
+    def __init__(self, workers=4, intervalo_host=1.0, timeout=20, motor=None, max_paginas=50, backfill=False):
+        self.workers = max(1, workers)
+        self.max_paginas = max(1, max_paginas)
+        self.backfill = backfill
+        self.motor = motor or criar_motor("hibrido", self.workers, timeout)
+        self.limitador = LimitadorPorHost(intervalo_host)
+        self.metricas = MetricasColeta()
+
+    def listar(self, url_cat):
+        self.limitador.aguardar(url_cat)
+        links = self.motor.listar(url_cat)
+        self.metricas.registrar_pagina()
+        return links
+
+    def varrer_categoria(self, url_cat, estado):
+        """Percorre /page/N/ até encontrar conteúdo já conhecido (ou até max_paginas, no modo backfill)"""
+        links_categoria = []
+        with span("coleta.categoria", url=url_cat) as s:
+            for n in range(1, self.max_paginas + 1):
+                try:
+                    links = [l for l in self.listar(url_pagina(url_cat, n)) if link_de_noticia(l)]
+                except requests.HTTPError:
+                    if n == 1: raise
+                    break # Passou da última página da listagem
+                if not links: break
+                novos = [l for l in links if not estado.conhece(l)]
+                links_categoria.extend(novos)
+                if len(novos) < len(links) and not self.backfill: break
+            s.anotar(paginas=n, novos=len(links_categoria))
+        return list(dict.fromkeys(links_categoria))
+
+    def ler_noticia(self, link, categoria):
+        self.limitador.aguardar(link)
+        with span("coleta.noticia", categoria=categoria):
+            noticia = self.motor.ler(link)
+        self.metricas.registrar_pagina()
+        return montar_registro(noticia, link, categoria)
+
+    def coletar(self, categorias, estado):
+        """Varre as listagens em paralelo e depois lê as notícias novas, preservando a ordem das categorias"""
+        self.metricas.iniciar()
+        conhecidos = set()
+        novos_dados = []
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            listagens = {cat: pool.submit(self.varrer_categoria, url, estado) for cat, url in categorias.items()}
+
+            pendentes = []
+            for categoria, futuro in listagens.items():
+                try:
+                    links_na_pagina = futuro.result()
+                except Exception as e:
+                    self.metricas.registrar_erro()
+                    print(f"⚠️ Erro ao varrer {categoria}: {e}")
+                    continue
+                print(f"🔍 {categoria}: {len(links_na_pagina)} links novos nas listagens.")
+                for link in links_na_pagina:
+                    if link not in conhecidos:
+                        conhecidos.add(link)
+                        pendentes.append((link, categoria))
+
+            leituras = [(link, pool.submit(self.ler_noticia, link, cat)) for link, cat in pendentes]
+            for link, futuro in leituras:
+                try:
+                    novos_dados.append(futuro.result())
+                    print(f"   🆕 Nova notícia encontrada: {link}")
+                except Exception as e:
+                    self.metricas.registrar_erro()
+                    print(f"   ⚠️ Falha ao ler {link}: {e}")
+
+        self.metricas.finalizar()
+        return novos_dados
+
+    def encerrar(self):
+        self.motor.encerrar()
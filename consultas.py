@@ -0,0 +1,52 @@
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+TABELA = "noticias_infra"
+# Colunas que o feed e os painéis mostram; o conteúdo completo só é buscado sob demanda
+COLUNAS_FEED = ["data_noticia", "titulo", "categoria", "link"]
+TAMANHO_PAGINA = 25 # Notícias por página do feed (a janela desenhada a cada rerun)
+TAMANHO_LOTE_LEITURA = 1000 # Limite padrão de linhas por resposta do PostgREST
+
+
+@dataclass(frozen=True)
+class Filtros:
+    """Filtros da sidebar (d_inicio, d_fim, sel_setores, busca) em forma imutável e hasheável"""
+    d_inicio: date
+    d_fim: date
+    setores: tuple = field(default_factory=tuple)
+    busca: str = ""
+
+
+def aplicar_filtros(consulta, filtros):
+    """Traduz os filtros da sidebar em predicados do banco (a busca textual é feita no índice local)"""
+    consulta = consulta.gte("data_noticia", filtros.d_inicio.isoformat())
+    # "< dia seguinte" funciona tanto para coluna date quanto timestamp
+    consulta = consulta.lt("data_noticia", (filtros.d_fim + timedelta(days=1)).isoformat())
+    if filtros.setores:
+        consulta = consulta.in_("categoria", list(filtros.setores))
+    return consulta
+
+def _ordenar(consulta):
+    # Desempate por link para que a paginação por faixa seja estável
+    return consulta.order("data_noticia", desc=True).order("link")
+
+
+def buscar_todos(cliente, colunas=COLUNAS_FEED, desde=None, filtros=None):
+    """Lê a tabela inteira em faixas (sem o teto silencioso de um único .limit()).
+
+    Com `desde`, só as linhas com data_noticia >= desde (o próprio dia entra, para pegar
+    notícias dele que chegaram depois da última leitura); com `filtros`, só o recorte da sidebar.
+    """
+    linhas, inicio = [], 0
+    while True:
+        consulta = cliente.table(TABELA).select(*colunas)
+        if desde is not None: consulta = consulta.gte("data_noticia", desde.isoformat())
+        if filtros is not None: consulta = aplicar_filtros(consulta, filtros)
+        res = _ordenar(consulta).range(inicio, inicio + TAMANHO_LOTE_LEITURA - 1).execute()
+        linhas.extend(res.data)
+        if len(res.data) < TAMANHO_LOTE_LEITURA: return linhas
+        inicio += TAMANHO_LOTE_LEITURA
+
+def buscar_conteudo(cliente, link):
+    res = cliente.table(TABELA).select("conteudo").eq("link", link).limit(1).execute()
+    return res.data[0]["conteudo"] if res.data else ""
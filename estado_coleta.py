@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+ARQUIVO_ESTADO = "estado_coleta.json"
+
+def hash_link(link):
+    return hashlib.sha1(link.encode("utf-8")).hexdigest()[:16]
+
+def _data_iso(data):
+    """Converte 'dd/mm/aaaa' (ou 'aaaa-mm-dd') para 'aaaa-mm-dd'; None se não for uma data"""
+    if hasattr(data, "strftime"): return data.strftime("%Y-%m-%d")
+    for formato in ("%d/%m/%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(data, formato).strftime("%Y-%m-%d")
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+class EstadoColeta:
+    """Marcas d'água por categoria (notícia mais recente vista) e conjunto de hashes dos links já conhecidos.
+
+    Substitui a leitura da planilha inteira só para saber quais links já foram capturados:
+    a consulta `conhece` é O(1) e o arquivo JSON é pequeno.
+    """
+
+    def __init__(self, caminho=ARQUIVO_ESTADO):
+        self.caminho = caminho
+        self.categorias = {}
+        self._todos = set()
+
+    @classmethod
+    def carregar(cls, caminho=ARQUIVO_ESTADO):
+        estado = cls(caminho)
+        if os.path.exists(caminho):
+            with open(caminho, encoding="utf-8") as f:
+                bruto = json.load(f)
+            for categoria, info in bruto.get("categorias", {}).items():
+                hashes = set(info.get("hashes", []))
+                estado.categorias[categoria] = {
+                    "ultimo_link": info.get("ultimo_link"),
+                    "ultima_data": info.get("ultima_data"),
+                    "hashes": hashes
+                }
+                estado._todos |= hashes
+        return estado
+
+    @property
+    def vazio(self):
+        return not self._todos
+
+    def __len__(self):
+        return len(self._todos)
+
+    def conhece(self, link):
+        return hash_link(link) in self._todos
+
+    def _categoria(self, categoria):
+        return self.categorias.setdefault(categoria, {"ultimo_link": None, "ultima_data": None, "hashes": set()})
+
+    def registrar(self, categoria, link, data=None):
+        h = hash_link(link)
+        info = self._categoria(categoria)
+        info["hashes"].add(h)
+        self._todos.add(h)
+        iso = _data_iso(data)
+        if iso and (info["ultima_data"] is None or iso >= info["ultima_data"]):
+            info["ultima_data"] = iso
+            info["ultimo_link"] = link
+
+    def importar(self, df):
+        """Semeia o estado a partir do histórico existente (colunas link, categoria e data_noticia)"""
+        for link, categoria, data in zip(df["link"].astype(str), df["categoria"].astype(str), df["data_noticia"]):
+            self.registrar(categoria, link, data)
+
+    def salvar(self):
+        bruto = {"categorias": {
+            categoria: {
+                "ultimo_link": info["ultimo_link"],
+                "ultima_data": info["ultima_data"],
+                "hashes": sorted(info["hashes"])
+            }
+            for categoria, info in sorted(self.categorias.items())
+        }}
+        temporario = f"{self.caminho}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(bruto, f, ensure_ascii=False, indent=1)
+        os.replace(temporario, self.caminho)
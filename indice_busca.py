@@ -0,0 +1,134 @@
+import bisect
+import math
+import re
+import unicodedata
+
+import numpy as np
+
+PESO_TITULO = 3 # Uma ocorrência no título vale mais que uma no corpo
+_TOKEN = re.compile(r"\w+")
+
+def normalizar(texto):
+    """Minúsculas e sem acentos: 'Mineração' -> 'mineracao'"""
+    return unicodedata.normalize("NFKD", str(texto).lower()).encode("ascii", "ignore").decode("ascii")
+
+def tokenizar(texto):
+    return _TOKEN.findall(normalizar(texto)) if texto else []
+
+def interpretar_consulta(consulta):
+    """Separa a consulta em frases ("entre aspas"), prefixos (termo*) e termos simples"""
+    frases = [tokenizar(f) for f in re.findall(r'"([^"]+)"', consulta)]
+    # Aspa sem par não abre frase: o texto depois dela vale como termos comuns
+    resto = re.sub(r'"[^"]*"', " ", consulta).replace('"', " ")
+    prefixos = [normalizar(p) for p in re.findall(r"(\w+)\*", resto)]
+    termos = tokenizar(re.sub(r"\w+\*", " ", resto))
+    return [f for f in frases if f], [p for p in prefixos if p], termos
+
+
+class IndiceBusca:
+    """Índice invertido (termo -> documentos) com acentos removidos.
+
+    As listas de documentos ficam em arrays numpy no formato CSR (um bloco contíguo por termo),
+    e cada documento guarda a sequência de ids de termos para conferir frases.
+    Os ids de documento são as posições na lista usada na construção.
+    """
+
+    def __init__(self, vocabulario, inicio, docs, pesos, sequencias):
+        self.vocabulario = vocabulario
+        self.termos_ordenados = sorted(vocabulario)
+        self.inicio = inicio
+        self.docs = docs
+        self.pesos = pesos
+        self.sequencias = sequencias
+        self.n_docs = len(sequencias)
+
+    @classmethod
+    def construir(cls, titulos, conteudos):
+        vazio = (np.empty(0, np.int32), np.empty(0, np.int64), np.empty(0, np.float32))
+        return cls._montar({}, [], vazio, titulos, conteudos)
+
+    def acrescentar(self, titulos, conteudos):
+        """Novo índice com os documentos extras no fim (ids seguem a ordem de chegada); o atual não muda"""
+        termos = np.repeat(np.arange(len(self.vocabulario), dtype=np.int64), np.diff(self.inicio))
+        return IndiceBusca._montar(dict(self.vocabulario), list(self.sequencias),
+                                   (self.docs, termos, self.pesos), titulos, conteudos)
+
+    @classmethod
+    def _montar(cls, vocabulario, sequencias, pares_existentes, titulos, conteudos):
+        pares_doc, pares_termo, pares_peso = ([p] for p in pares_existentes)
+        for doc, (titulo, conteudo) in enumerate(zip(titulos, conteudos), start=len(sequencias)):
+            ids_titulo = [vocabulario.setdefault(t, len(vocabulario)) for t in tokenizar(titulo)]
+            ids_corpo = [vocabulario.setdefault(t, len(vocabulario)) for t in tokenizar(conteudo)]
+            # -1 separa título e corpo para que uma frase não "atravesse" os dois
+            sequencias.append(np.array(ids_titulo + [-1] + ids_corpo, dtype=np.int32))
+            pares_doc.append(np.full(len(ids_titulo) + len(ids_corpo), doc, dtype=np.int32))
+            pares_termo.append(np.array(ids_titulo + ids_corpo, dtype=np.int64))
+            pares_peso.append(np.concatenate([np.full(len(ids_titulo), PESO_TITULO, dtype=np.float32),
+                                              np.ones(len(ids_corpo), dtype=np.float32)]))
+
+        n_termos, n_docs = len(vocabulario), len(sequencias)
+        doc = np.concatenate(pares_doc).astype(np.int64)
+        termo = np.concatenate(pares_termo)
+        peso = np.concatenate(pares_peso)
+        # Agrega (termo, doc) repetidos somando os pesos, já ordenado por termo e depois por doc
+        chaves, inverso = np.unique(termo * max(1, n_docs) + doc, return_inverse=True)
+        pesos = np.bincount(inverso, weights=peso, minlength=len(chaves)).astype(np.float32)
+        docs = (chaves % max(1, n_docs)).astype(np.int32)
+        inicio = np.searchsorted(chaves // max(1, n_docs), np.arange(n_termos + 1))
+        return cls(vocabulario, inicio, docs, pesos, sequencias)
+
+    # ==========================================================================
+    # CONSULTA
+    # ==========================================================================
+    def _postagens(self, termo_id):
+        a, b = self.inicio[termo_id], self.inicio[termo_id + 1]
+        return self.docs[a:b], self.pesos[a:b]
+
+    def _idf(self, qtd_docs):
+        return math.log(1 + self.n_docs / max(1, qtd_docs))
+
+    def _termos_com_prefixo(self, prefixo):
+        i = bisect.bisect_left(self.termos_ordenados, prefixo)
+        j = bisect.bisect_left(self.termos_ordenados, prefixo + "\uffff")
+        return [self.vocabulario[t] for t in self.termos_ordenados[i:j]]
+
+    def _tem_frase(self, doc, ids):
+        seq = self.sequencias[doc]
+        posicoes = np.flatnonzero(seq[:len(seq) - len(ids) + 1] == ids[0])
+        for deslocamento, termo_id in enumerate(ids[1:], start=1):
+            if not len(posicoes): return False
+            posicoes = posicoes[seq[posicoes + deslocamento] == termo_id]
+        return len(posicoes) > 0
+
+    def buscar(self, consulta):
+        """Ids dos documentos que atendem a TODAS as partes da consulta, do mais relevante ao menos"""
+        frases, prefixos, termos = interpretar_consulta(consulta)
+        if not (frases or prefixos or termos) or not self.n_docs: return []
+
+        # Cada cláusula é um grupo de ids de termo (qualquer um deles satisfaz a cláusula)
+        clausulas = [[self.vocabulario.get(t, -1)] for t in termos]
+        clausulas += [[self.vocabulario.get(t, -1)] for f in frases for t in f]
+        clausulas += [self._termos_com_prefixo(p) or [-1] for p in prefixos]
+
+        candidatos = None
+        pontuacao = np.zeros(self.n_docs, dtype=np.float32)
+        for grupo in clausulas:
+            docs_clausula = []
+            for termo_id in grupo:
+                if termo_id < 0: continue
+                docs, pesos = self._postagens(termo_id)
+                pontuacao[docs] += self._idf(len(docs)) * np.log1p(pesos)
+                docs_clausula.append(docs)
+            if not docs_clausula: return []
+            docs_clausula = np.unique(np.concatenate(docs_clausula))
+            candidatos = docs_clausula if candidatos is None else np.intersect1d(candidatos, docs_clausula, assume_unique=True)
+            if not len(candidatos): return []
+
+        for frase in frases:
+            if len(frase) < 2: continue
+            ids = np.array([self.vocabulario[t] for t in frase], dtype=np.int32)
+            candidatos = candidatos[[self._tem_frase(d, ids) for d in candidatos]]
+
+        # Mais relevante primeiro; empate mantém a ordem dos ids (a da construção)
+        ordem = np.lexsort((candidatos, -pontuacao[candidatos]))
+        return candidatos[ordem].tolist()
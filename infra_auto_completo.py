@@ -1,18 +1,16 @@
 import pandas as pd
-import time
 import os
-import re
-from tqdm import tqdm
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+from armazenamento import abrir_armazenamento, do_formato_planilha, exportar_excel
+from coleta import ColetorConcorrente
+from estado_coleta import ARQUIVO_ESTADO, EstadoColeta
+from motores import criar_motor
+from telemetria import telemetria
 
 # ==============================================================================
 # CONFIGURAÇÕES
 # ==============================================================================
-ARQUIVO_EXCEL = "AgenciaInfra_Historico.xlsx"
+# Relatório Excel é opcional (o histórico fica no banco SQLite de armazenamento.py)
+EXPORTAR_EXCEL = os.environ.get("INFRA_EXPORTAR_EXCEL") == "1"
 
 CATEGORIAS_SITE = {
     "Transporte": "https://agenciainfra.com/blog/category/infratransporte/",
@@ -26,91 +24,48 @@ CATEGORIAS_SITE = {
     "Eventos": "https://agenciainfra.com/blog/category/infraliveventos/"
 }
 
-def configurar_driver():
-    options = Options()
-    options.add_argument("--headless=new") 
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--window-size=1920,1080")
-    # NOVIDADE: User-Agent para evitar bloqueios do site
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-
-def extrair_data_limpa(texto):
-    match = re.search(r'(\d{2}/\d{2}/\d{4})', str(texto))
-    return match.group(1) if match else "S/D"
+# Workers do pool de coleta e intervalo mínimo (s) entre requisições ao mesmo host
+WORKERS = int(os.environ.get("INFRA_WORKERS", "4"))
+INTERVALO_HOST = float(os.environ.get("INFRA_INTERVALO_HOST", "1.0"))
+# Motor de páginas: "hibrido" (HTTP + Selenium só quando necessário), "http" ou "selenium"
+MOTOR = os.environ.get("INFRA_MOTOR", "hibrido")
+# Paginação das listagens: para ao encontrar conteúdo conhecido; INFRA_BACKFILL=1 ignora a parada e vai fundo
+BACKFILL = os.environ.get("INFRA_BACKFILL") == "1"
+MAX_PAGINAS = int(os.environ.get("INFRA_MAX_PAGINAS", "200" if BACKFILL else "20"))
 
 # ==============================================================================
 # PROCESSO UNIFICADO
 # ==============================================================================
-driver = configurar_driver()
-print("🚀 Iniciando Motor de Captura...")
+coletor = ColetorConcorrente(workers=WORKERS, intervalo_host=INTERVALO_HOST, motor=criar_motor(MOTOR, WORKERS),
+                             max_paginas=MAX_PAGINAS, backfill=BACKFILL)
+print(f"🚀 Iniciando Motor de Captura ({MOTOR}, {WORKERS} workers)...")
+
+armazenamento = abrir_armazenamento()
 
 try:
-    links_existentes = []
-    if os.path.exists(ARQUIVO_EXCEL):
-        df_base = pd.read_excel(ARQUIVO_EXCEL, sheet_name="Visão Geral")
-        links_existentes = df_base['Link'].astype(str).tolist()
-        print(f"📦 Base carregada: {len(links_existentes)} links já conhecidos.")
-    else:
-        df_base = pd.DataFrame(columns=["Data", "Título", "Link", "Categoria", "Fonte", "Conteúdo"])
+    estado = EstadoColeta.carregar(ARQUIVO_ESTADO)
+    if estado.vazio and len(armazenamento):
+        # Migração única: semeia o estado a partir do histórico (só as colunas necessárias)
+        estado.importar(armazenamento.ler(["link", "categoria", "data_noticia"]))
+        estado.salvar()
+    print(f"📦 Estado carregado: {len(estado)} links já conhecidos.")
 
-    novos_dados = []
+    novos_dados = coletor.coletar(CATEGORIAS_SITE, estado)
+    print(coletor.metricas.resumo())
+    if hasattr(coletor.motor, "fallbacks"):
+        print(f"🧭 Páginas que precisaram do Selenium: {coletor.motor.fallbacks}")
 
-    for categoria, url_cat in CATEGORIAS_SITE.items():
-        print(f"🔍 Varrendo: {categoria}...")
-        try:
-            driver.get(url_cat)
-            time.sleep(5) # Aumentamos um pouco o tempo de espera
-            
-            # Seletores mais abrangentes para garantir a captura
-            elementos = driver.find_elements(By.CSS_SELECTOR, "h2 a, h3 a, .elementor-post__title a, article a")
-            links_na_pagina = list(set([el.get_attribute("href") for el in elementos if el.get_attribute("href")]))
-            
-            for link in links_na_pagina:
-                # Filtro de segurança para pegar apenas notícias reais
-                if link not in links_existentes and "/blog/" in link and "/category/" not in link:
-                    print(f"   🆕 Nova notícia encontrada: {link}")
-                    driver.get(link)
-                    time.sleep(2)
-                    
-                    try:
-                        titulo = driver.find_element(By.TAG_NAME, "h1").text.strip()
-                        # Tenta pegar a data de várias formas possíveis
-                        try:
-                            data_bruta = driver.find_element(By.CLASS_NAME, "datas-noticia-inline").text
-                        except:
-                            data_bruta = driver.find_element(By.CSS_SELECTOR, ".elementor-post-info__item--type-date").text
-                    except: 
-                        titulo, data_bruta = "Título não localizado", ""
+    if novos_dados:
+        qtd = armazenamento.inserir(do_formato_planilha(pd.DataFrame(novos_dados)))
 
-                    corpo = driver.find_elements(By.CSS_SELECTOR, ".elementor-widget-theme-post-content p, .entry-content p")
-                    texto = "\n".join([p.text.strip() for p in corpo if p.text.strip()])
-                    
-                    novos_dados.append({
-                        "Data": extrair_data_limpa(data_bruta),
-                        "Título": titulo,
-                        "Link": link,
-                        "Categoria": categoria,
-                        "Fonte": "Agência iNFRA",
-                        "Conteúdo": texto if texto else "Texto não extraído"
-                    })
-                    links_existentes.append(link)
-        except Exception as e:
-            print(f"⚠️ Erro ao varrer {categoria}: {e}")
-            continue
+        # O estado só avança depois que as notícias estão gravadas
+        for r in novos_dados: estado.registrar(r["Categoria"], r["Link"], r["Data"])
+        estado.salvar()
+        print(f"✅ SUCESSO! {qtd} notícias foram salvas no histórico.")
 
-    if novos_dados:
-        df_novos = pd.DataFrame(novos_dados)
-        df_final = pd.concat([df_novos, df_base]).drop_duplicates(subset=['Link'])
-        
-        with pd.ExcelWriter(ARQUIVO_EXCEL, engine='openpyxl') as writer:
-            df_final.to_excel(writer, sheet_name="Visão Geral", index=False)
-            for cat in df_final['Categoria'].unique():
-                df_cat = df_final[df_final['Categoria'] == cat].drop(columns=['Categoria'])
-                df_cat.to_excel(writer, sheet_name=str(cat)[:30], index=False)
-        
-        print(f"✅ SUCESSO! {len(df_novos)} notícias foram salvas no Excel.")
+        if EXPORTAR_EXCEL:
+            exportar_excel(armazenamento)
+            print("📄 Relatório Excel atualizado.")
     else:
         print("🙌 O site foi varrido, mas não foram encontradas notícias novas hoje.")
 
@@ -118,4 +73,6 @@ except Exception as e:
     print(f"❌ ERRO CRÍTICO NO PROCESSO: {e}")
 
 finally:
-    driver.quit()
\ No newline at end of file
+    coletor.encerrar()
+    armazenamento.fechar()
+    telemetria.emitir_resumo()
\ No newline at end of file
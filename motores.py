@@ -0,0 +1,192 @@
+import threading
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from telemetria import contar, cronometrar
+
+# ==============================================================================
+# SELETORES E EXTRAÇÃO (funções puras, testáveis com HTML salvo)
+# ==============================================================================
+SELETOR_LINKS = "h2 a, h3 a, .elementor-post__title a, article a"
+SELETOR_CORPO = ".elementor-widget-theme-post-content p, .entry-content p"
+SELETORES_DATA = [".datas-noticia-inline", ".elementor-post-info__item--type-date"]
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+def _sopa(html):
+    return BeautifulSoup(html, "lxml")
+
+def extrair_links_listagem(html, url_base):
+    hrefs = [a.get("href") for a in _sopa(html).select(SELETOR_LINKS)]
+    return list(dict.fromkeys(urljoin(url_base, h) for h in hrefs if h))
+
+def extrair_noticia(html):
+    """Devolve {'titulo', 'data_bruta', 'texto'}; campos não encontrados ficam vazios"""
+    sopa = _sopa(html)
+    h1 = sopa.find("h1")
+    titulo = h1.get_text(" ", strip=True) if h1 else ""
+    data_bruta = ""
+    for seletor in SELETORES_DATA:
+        el = sopa.select_one(seletor)
+        if el:
+            data_bruta = el.get_text(" ", strip=True)
+            break
+    paragrafos = [p.get_text(" ", strip=True) for p in sopa.select(SELETOR_CORPO)]
+    return {"titulo": titulo, "data_bruta": data_bruta, "texto": "\n".join(p for p in paragrafos if p)}
+
+def precisa_fallback(noticia):
+    """O caminho rápido falhou se não trouxe título ou corpo (página dependente de JS, bloqueio etc.)"""
+    return not noticia["titulo"] or not noticia["texto"]
+
+# ==============================================================================
+# MOTORES DE BUSCA DE PÁGINAS
+# ==============================================================================
+class MotorHTTP:
+    """Requisições HTTP simples com pool de conexões, keep-alive e gzip"""
+
+    def __init__(self, workers=4, timeout=20):
+        self.timeout = timeout
+        self.sessao = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=4, pool_maxsize=max(4, workers), max_retries=2)
+        self.sessao.mount("https://", adaptador)
+        self.sessao.mount("http://", adaptador)
+        self.sessao.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive"
+        })
+
+    def _baixar(self, url):
+        resposta = self.sessao.get(url, timeout=self.timeout)
+        resposta.raise_for_status()
+        return resposta.text
+
+    def listar(self, url):
+        return extrair_links_listagem(self._baixar(url), url)
+
+    def ler(self, url):
+        return extrair_noticia(self._baixar(url))
+
+    def encerrar(self):
+        self.sessao.close()
+
+
+@cronometrar("selenium.configurar_driver")
+def configurar_driver():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1920,1080")
+    # NOVIDADE: User-Agent para evitar bloqueios do site
+    options.add_argument(f"user-agent={USER_AGENT}")
+    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+
+
+class MotorSelenium:
+    """Chrome headless (um navegador por thread), criado só quando for realmente usado"""
+
+    def __init__(self, timeout=20, fabrica_driver=configurar_driver):
+        self.timeout = timeout
+        self.fabrica_driver = fabrica_driver
+        self._local = threading.local()
+        self._drivers = []
+        self._lock = threading.Lock()
+
+    def _driver(self):
+        driver = getattr(self._local, "driver", None)
+        if driver is None:
+            driver = self.fabrica_driver()
+            self._local.driver = driver
+            with self._lock: self._drivers.append(driver)
+        return driver
+
+    def _renderizar(self, url, seletor):
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        driver = self._driver()
+        driver.get(url)
+        # Espera o documento terminar de carregar e o seletor principal aparecer (no lugar do sleep fixo)
+        espera = WebDriverWait(driver, self.timeout)
+        espera.until(lambda d: d.execute_script("return document.readyState") == "complete")
+        try:
+            espera.until(EC.presence_of_element_located((By.CSS_SELECTOR, seletor)))
+        except TimeoutException:
+            pass # Página sem o seletor: segue com o que tiver carregado
+        return driver.page_source
+
+    def listar(self, url):
+        return extrair_links_listagem(self._renderizar(url, SELETOR_LINKS), url)
+
+    def ler(self, url):
+        return extrair_noticia(self._renderizar(url, "h1"))
+
+    def encerrar(self):
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+class MotorHibrido:
+    """Usa o motor rápido e só recorre ao reserva (Selenium) quando a extração vem vazia"""
+
+    def __init__(self, rapido, reserva):
+        self.rapido = rapido
+        self.reserva = reserva
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+
+    def _contar_fallback(self):
+        with self._lock: self.fallbacks += 1
+        contar("motor.fallback_selenium")
+
+    def listar(self, url):
+        try:
+            links = self.rapido.listar(url)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404: raise
+            links = []
+        except requests.RequestException:
+            links = []
+        if links: return links
+        self._contar_fallback()
+        return self.reserva.listar(url)
+
+    def ler(self, url):
+        try:
+            noticia = self.rapido.ler(url)
+        except requests.RequestException:
+            noticia = None
+        if noticia is None or precisa_fallback(noticia):
+            self._contar_fallback()
+            return self.reserva.ler(url)
+        return noticia
+
+    def encerrar(self):
+        self.rapido.encerrar()
+        self.reserva.encerrar()
+
+
+def criar_motor(nome="hibrido", workers=4, timeout=20):
+    if nome == "http":
+        return MotorHTTP(workers, timeout)
+    if nome == "selenium":
+        return MotorSelenium(timeout)
+    if nome == "hibrido":
+        return MotorHibrido(MotorHTTP(workers, timeout), MotorSelenium(timeout))
+    raise ValueError(f"Motor desconhecido: {nome}")
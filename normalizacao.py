@@ -0,0 +1,58 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Assinaturas da fonte que aparecem nos títulos raspados
+TERMOS_FONTE = ["Agência iNFRA", "AGÊNCIA INFRA", "Agencia iNFRA", "Agencia Infra", "iNFRA"]
+_FONTE_NO_TITULO = re.compile("|".join(re.escape(t) for t in TERMOS_FONTE))
+COLUNAS_CATEGORICAS = ["categoria", "fonte"] # Poucos valores repetidos em milhares de linhas
+SEM_DATA = np.iinfo(np.int32).min # Ordinal das linhas sem data: fica fora de qualquer período
+
+
+def limpar_titulos(titulos):
+    """Versão vetorizada do antigo limpar_titulo: tira a assinatura da fonte e a pontuação que sobra no início"""
+    # O padrão vai como texto: com strings do pyarrow (padrão no pandas 3) a troca roda no RE2, sem voltar ao Python
+    return titulos.str.replace(_FONTE_NO_TITULO.pattern, "", regex=True).str.strip().str.lstrip(" -|: ")
+
+def ordinal(dia):
+    """Dias desde 1970-01-01 (mesma escala da coluna `dia`)"""
+    return int(np.datetime64(dia, "D").astype(np.int64))
+
+def preparar_noticias(df):
+    """Frame compacto e tipado: datas em datetime64 + ordinal do dia (int32), categóricas e título limpo"""
+    if df.empty: return df
+    df['data_noticia'] = pd.to_datetime(df['data_noticia'])
+    dias = df['data_noticia'].to_numpy(dtype="datetime64[D]")
+    df['dia'] = np.where(np.isnat(dias), SEM_DATA, dias.astype(np.int64)).astype(np.int32)
+    for coluna in COLUNAS_CATEGORICAS:
+        if coluna in df: df[coluna] = df[coluna].astype("category")
+    df['titulo_limpo'] = limpar_titulos(df['titulo'])
+    return df
+
+def concatenar(df, novas):
+    """pd.concat que preserva as categóricas (categorias diferentes viram object no concat puro)"""
+    novas = novas[df.columns]
+    for coluna in COLUNAS_CATEGORICAS:
+        if coluna in df and isinstance(df[coluna].dtype, pd.CategoricalDtype):
+            categorias = df[coluna].cat.categories.union(novas[coluna].astype("category").cat.categories)
+            df = df.assign(**{coluna: df[coluna].cat.set_categories(categorias)})
+            novas = novas.assign(**{coluna: pd.Categorical(novas[coluna], categories=categorias)})
+    return pd.concat([df, novas], ignore_index=True)
+
+def selecionar(df, d_inicio, d_fim, setores=()):
+    """Posições (array de índices) das linhas no período [d_inicio, d_fim] e nos setores (vazio = todos).
+
+    Os recortes do app guardam só estas posições; as linhas são materializadas na hora de exibir.
+    """
+    if df.empty: return np.empty(0, dtype=np.int64)
+    dia = df['dia'].to_numpy()
+    mascara = (dia >= ordinal(d_inicio)) & (dia <= ordinal(d_fim))
+    if setores:
+        categoria = df['categoria']
+        if isinstance(categoria.dtype, pd.CategoricalDtype):
+            codigos = categoria.cat.categories.get_indexer(list(setores))
+            mascara &= np.isin(categoria.cat.codes.to_numpy(), codigos[codigos >= 0])
+        else:
+            mascara &= categoria.isin(setores).to_numpy()
+    return np.flatnonzero(mascara)
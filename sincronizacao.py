@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+
+ARQUIVO_MANIFESTO = "manifesto_supabase.json"
+COLUNAS_SYNC = ["data_noticia", "fonte", "categoria", "titulo", "conteudo", "link"]
+
+def hash_conteudo(registro):
+    """Hash estável do conteúdo enviado ao banco (muda se qualquer coluna sincronizada mudar)"""
+    canonico = json.dumps([registro.get(c) for c in COLUNAS_SYNC], ensure_ascii=False, default=str)
+    return hashlib.sha1(canonico.encode("utf-8")).hexdigest()
+
+
+class Manifesto:
+    """O que foi enviado por último ao Supabase: {link: hash do conteúdo}"""
+
+    def __init__(self, caminho=ARQUIVO_MANIFESTO, hashes=None):
+        self.caminho = caminho
+        self.hashes = hashes or {}
+
+    @classmethod
+    def carregar(cls, caminho=ARQUIVO_MANIFESTO):
+        if os.path.exists(caminho):
+            with open(caminho, encoding="utf-8") as f:
+                return cls(caminho, json.load(f))
+        return cls(caminho)
+
+    def salvar(self):
+        temporario = f"{self.caminho}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(self.hashes, f, ensure_ascii=False, indent=0, sort_keys=True)
+        os.replace(temporario, self.caminho)
+
+
+def calcular_delta(registros, manifesto):
+    """Separa os registros em novos, alterados e inalterados em relação ao manifesto"""
+    novos, alterados, inalterados = [], [], 0
+    for r in registros:
+        anterior = manifesto.hashes.get(r["link"])
+        if anterior is None:
+            novos.append(r)
+        elif anterior != hash_conteudo(r):
+            alterados.append(r)
+        else:
+            inalterados += 1
+    return novos, alterados, inalterados
+
+
+def sincronizar(registros, manifesto, enviar, completo=False, simulacao=False):
+    """Envia só o que mudou desde o último envio (ou tudo, no modo completo) e atualiza o manifesto.
+
+    `enviar(registros)` faz o upload e devolve os registros confirmados (ver uploader.py).
+    Devolve um relatório com as contagens; no modo simulação nada é enviado nem gravado.
+    """
+    novos, alterados, inalterados = calcular_delta(registros, manifesto)
+    pendentes = list(registros) if completo else novos + alterados
+    relatorio = {
+        "total": len(registros),
+        "novos": len(novos),
+        "alterados": len(alterados),
+        "inalterados": inalterados,
+        "a_enviar": len(pendentes),
+        "enviados": 0,
+        "falhas": 0
+    }
+    if simulacao or not pendentes:
+        return relatorio
+
+    confirmados = enviar(pendentes)
+    if completo:
+        # Reconciliação: o manifesto passa a refletir exatamente a base local
+        manifesto.hashes = {}
+    for r in confirmados:
+        manifesto.hashes[r["link"]] = hash_conteudo(r)
+    manifesto.salvar()
+
+    relatorio["enviados"] = len(confirmados)
+    relatorio["falhas"] = len(pendentes) - len(confirmados)
+    return relatorio
@@ -0,0 +1,157 @@
+"""Instrumentação leve: spans (trechos cronometrados), contadores e histogramas de latência.
+
+Desligada por padrão; INFRA_TELEMETRIA=1 liga. Com ela ligada, cada span encerrado vira uma
+linha JSON no stderr (ou no arquivo de INFRA_TELEMETRIA_ARQUIVO) e entra no histograma do seu nome.
+
+    from telemetria import contar, cronometrar, span
+
+    with span("coleta.categoria", categoria="Energia"):
+        ...
+
+    @cronometrar("historico.inserir")
+    def inserir(...): ...
+"""
+import functools
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+# Limites dos baldes do histograma: de 0,01 ms a ~30 min, crescendo 25% a cada balde
+_BASE_MS = 0.01
+_RAZAO = 1.25
+_BALDES = 100
+
+
+class Histograma:
+    """Latências em baldes de escala logarítmica: memória fixa, percentis com erro de até 25%"""
+
+    def __init__(self):
+        self.baldes = [0] * (_BALDES + 1)
+        self.n = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def registrar(self, ms):
+        balde = 0 if ms <= _BASE_MS else min(_BALDES, math.ceil(math.log(ms / _BASE_MS, _RAZAO)))
+        self.baldes[balde] += 1
+        self.n += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentil(self, p):
+        """Limite superior do balde onde está o p-ésimo percentil"""
+        if not self.n: return 0.0
+        alvo, acumulado = p / 100 * self.n, 0
+        for balde, qtd in enumerate(self.baldes):
+            acumulado += qtd
+            if acumulado >= alvo: return min(self.max_ms, _BASE_MS * _RAZAO ** balde)
+        return self.max_ms
+
+    def resumo(self):
+        return {"n": self.n, "total_ms": round(self.total_ms, 1), "media_ms": round(self.total_ms / max(1, self.n), 2),
+                "p50_ms": round(self.percentil(50), 2), "p95_ms": round(self.percentil(95), 2),
+                "p99_ms": round(self.percentil(99), 2), "max_ms": round(self.max_ms, 2)}
+
+
+class _SpanNulo:
+    """Devolvido quando a telemetria está desligada: entrar e sair não custam nada além da chamada"""
+    __slots__ = ()
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+    def anotar(self, **atributos): pass
+
+_NULO = _SpanNulo()
+
+
+class _Span:
+    __slots__ = ("telemetria", "nome", "atributos", "inicio")
+
+    def __init__(self, telemetria, nome, atributos):
+        self.telemetria = telemetria
+        self.nome = nome
+        self.atributos = atributos
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def anotar(self, **atributos):
+        """Acrescenta atributos conhecidos só durante o trecho (ex.: quantidade de linhas lidas)"""
+        self.atributos.update(atributos)
+
+    def __exit__(self, tipo, erro, _tb):
+        ms = (time.perf_counter() - self.inicio) * 1000
+        self.telemetria.observar(self.nome, ms)
+        if erro is not None: self.telemetria.contar(f"{self.nome}.erro")
+        self.telemetria.emitir({"evento": "span", "nome": self.nome, "ms": round(ms, 3), "ok": erro is None,
+                                **self.atributos})
+        return False
+
+
+class Telemetria:
+    def __init__(self, ativa=False, arquivo=None):
+        self.ativa = ativa
+        self.arquivo = arquivo
+        self.contadores = Counter()
+        self.histogramas = {}
+        self._lock = threading.Lock()
+
+    def span(self, nome, **atributos):
+        return _Span(self, nome, atributos) if self.ativa else _NULO
+
+    def cronometrar(self, nome=None):
+        """Decorador: cada chamada da função vira um span (nome padrão: modulo.funcao)"""
+        def decorador(funcao):
+            rotulo = nome or f"{funcao.__module__}.{funcao.__qualname__}"
+            @functools.wraps(funcao)
+            def envolvida(*args, **kwargs):
+                if not self.ativa: return funcao(*args, **kwargs)
+                with _Span(self, rotulo, {}):
+                    return funcao(*args, **kwargs)
+            return envolvida
+        return decorador
+
+    def contar(self, nome, n=1):
+        if not self.ativa: return
+        with self._lock:
+            self.contadores[nome] += n
+
+    def observar(self, nome, ms):
+        if not self.ativa: return
+        with self._lock:
+            self.histogramas.setdefault(nome, Histograma()).registrar(ms)
+
+    def emitir(self, evento):
+        linha = json.dumps({"quando": datetime.now().isoformat(timespec="milliseconds"), **evento},
+                           ensure_ascii=False, default=str)
+        with self._lock:
+            if self.arquivo:
+                with open(self.arquivo, "a", encoding="utf-8") as f: f.write(linha + "\n")
+            else:
+                print(linha, file=sys.stderr, flush=True)
+
+    def resumo(self):
+        """{"spans": {nome: estatísticas}, "contadores": {nome: valor}}"""
+        with self._lock:
+            return {"spans": {nome: h.resumo() for nome, h in sorted(self.histogramas.items())},
+                    "contadores": dict(sorted(self.contadores.items()))}
+
+    def emitir_resumo(self):
+        if self.ativa: self.emitir({"evento": "resumo", **self.resumo()})
+
+    def limpar(self):
+        with self._lock:
+            self.contadores.clear()
+            self.histogramas.clear()
+
+
+telemetria = Telemetria(ativa=os.environ.get("INFRA_TELEMETRIA") == "1",
+                        arquivo=os.environ.get("INFRA_TELEMETRIA_ARQUIVO") or None)
+span = telemetria.span
+cronometrar = telemetria.cronometrar
+contar = telemetria.contar
@@ -0,0 +1,104 @@
+import re
+import threading
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+from indice_busca import normalizar
+
+IGNORAR = {"a", "ao", "por", "à", "e", "o", "as", "os", "de", "do", "da", "dos", "das", "em", "no", "na", "nos", "nas", "para", "com", "que", "se", "sobre", "mais", "até", "ate", "foi", "está", "tem", "diz", "nova", "onde", "portanto", "ma", "r", "dia", "não", "cade"}
+_PALAVRA = re.compile(r"\w[\w']*") # Mesmo padrão do WordCloud.generate
+
+
+class EstatisticasTermos:
+    """Contagem de termos por notícia (títulos), montada uma vez por atualização dos dados.
+
+    Os termos são agrupados sem acento ('mineração' e 'mineracao' contam juntos) e exibidos na
+    grafia mais frequente. A seleção de um filtro vira uma soma das contagens das linhas escolhidas.
+    """
+
+    def __init__(self, docs, termos, contagens, exibicao, n_docs):
+        self.docs = docs
+        self.termos = termos
+        self.contagens = contagens
+        self.exibicao = exibicao
+        self.n_docs = n_docs
+        self.imagens = CacheLRU(32)
+
+    @classmethod
+    def construir(cls, titulos, ignorar=IGNORAR):
+        ignorar = {normalizar(p) for p in ignorar}
+        chaves, grafias = {}, []
+        docs, termos = [], []
+        for doc, titulo in enumerate(titulos):
+            if not isinstance(titulo, str): continue
+            for palavra in _PALAVRA.findall(titulo.lower()):
+                if palavra.isdigit(): continue
+                chave = normalizar(palavra)
+                if chave in ignorar: continue
+                termo = chaves.get(chave)
+                if termo is None:
+                    termo = chaves[chave] = len(grafias)
+                    grafias.append(Counter())
+                grafias[termo][palavra] += 1
+                docs.append(doc)
+                termos.append(termo)
+
+        # Uma entrada por (notícia, termo), com a quantidade de ocorrências
+        n_docs = len(titulos)
+        if termos:
+            chave = np.array(docs, dtype=np.int64) * len(grafias) + np.array(termos, dtype=np.int64)
+            unicos, contagens = np.unique(chave, return_counts=True)
+            docs_arr = (unicos // len(grafias)).astype(np.int32)
+            termos_arr = (unicos % len(grafias)).astype(np.int32)
+        else:
+            docs_arr, termos_arr, contagens = np.empty(0, np.int32), np.empty(0, np.int32), np.empty(0, np.int64)
+        exibicao = [g.most_common(1)[0][0] for g in grafias]
+        return cls(docs_arr, termos_arr, contagens.astype(np.int32), exibicao, n_docs)
+
+    def frequencias(self, linhas=None, max_palavras=17):
+        """{termo: ocorrências} dos termos mais frequentes nas linhas escolhidas (posições; None = todas)"""
+        if linhas is None:
+            selecionados = slice(None)
+        else:
+            mascara = np.zeros(self.n_docs, dtype=bool)
+            mascara[np.asarray(linhas, dtype=np.int64)] = True
+            selecionados = mascara[self.docs]
+        total = np.bincount(self.termos[selecionados], weights=self.contagens[selecionados],
+                            minlength=len(self.exibicao))
+        topo = np.argsort(-total, kind="stable")[:max_palavras]
+        return {self.exibicao[t]: int(total[t]) for t in topo if total[t] > 0}
+
+
+class CacheLRU:
+    """Dicionário limitado que descarta o item usado há mais tempo (seguro entre sessões)"""
+
+    def __init__(self, tamanho=32):
+        self.tamanho = tamanho
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.faltas = 0
+
+    def obter(self, chave, gerar):
+        with self._lock:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave]
+            self.faltas += 1
+        valor = gerar()
+        with self._lock:
+            self._itens[chave] = valor
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho:
+                self._itens.popitem(last=False)
+        return valor
+
+
+def renderizar_nuvem(frequencias, max_palavras=17):
+    """Imagem (PIL) da nuvem de palavras, sem passar por figuras do matplotlib"""
+    from wordcloud import WordCloud # Importa matplotlib junto: só quando a nuvem é desenhada
+    wc = WordCloud(width=800, height=400, background_color='#000000', colormap='Oranges', max_words=max_palavras,
+                   prefer_horizontal=1.0, random_state=42)
+    return wc.generate_from_frequencies(frequencias).to_image()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Módulos do projeto na raiz; fixtures HTML e o Supabase falso ficam em benchmarks/
+sys.path[:0] = [RAIZ, os.path.join(RAIZ, "benchmarks")]
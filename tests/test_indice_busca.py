@@ -0,0 +1,17 @@
+from indice_busca import IndiceBusca, interpretar_consulta
+
+
+def test_frases_prefixos_e_termos():
+    assert interpretar_consulta('"Energia Solar" hidro* leilão') == ([["energia", "solar"]], ["hidro"], ["leilao"])
+
+
+def test_aspa_sem_par_vira_termos_comuns():
+    assert interpretar_consulta('"energia solar') == ([], [], ["energia", "solar"])
+    assert interpretar_consulta('leilão "energia') == ([], [], ["leilao", "energia"])
+    assert interpretar_consulta('"porto seco" "ferrovia') == ([["porto", "seco"]], [], ["ferrovia"])
+
+
+def test_busca_com_aspa_sem_par_encontra_as_palavras():
+    indice = IndiceBusca.construir(["Leilão de energia solar", "Ferrovia no porto"], ["", ""])
+    assert list(indice.buscar('"energia solar')) == [0]
+    assert list(indice.buscar('leilão "energia')) == [0]
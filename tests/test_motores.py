@@ -0,0 +1,39 @@
+from coleta import extrair_data_limpa
+from motores import extrair_links_listagem, extrair_noticia, precisa_fallback
+from servidor_local import ler_fixture
+
+URL_CATEGORIA = "https://agenciainfra.com/blog/category/infraenergia/"
+
+
+def test_listagem_traz_links_das_noticias_sem_repetir():
+    links = extrair_links_listagem(ler_fixture("listagem_categoria.html"), URL_CATEGORIA)
+    # O "Leia mais" repete o link do título; menu e paginação não entram
+    assert links == [
+        "https://agenciainfra.com/blog/aneel-aprova-revisao-tarifaria-de-distribuidoras/",
+        "https://agenciainfra.com/blog/leilao-de-transmissao-atrai-r-20-bilhoes/",
+        "https://agenciainfra.com/blog/mme-publica-diretrizes-para-armazenamento/",
+    ]
+
+
+def test_noticia_completa():
+    noticia = extrair_noticia(ler_fixture("noticia.html"))
+    assert noticia["titulo"] == "Agência iNFRA - Leilão de transmissão atrai R$ 20 bilhões"
+    assert extrair_data_limpa(noticia["data_bruta"]) == "14/01/2026"
+    paragrafos = noticia["texto"].split("\n")
+    assert len(paragrafos) == 5 # O <p> vazio é descartado
+    assert paragrafos[0].startswith("O leilão de transmissão realizado nesta quarta-feira (14)")
+    assert "• Lote 2: São Paulo" in paragrafos
+    assert not precisa_fallback(noticia)
+
+
+def test_noticia_sem_corpo_aciona_fallback():
+    noticia = extrair_noticia(ler_fixture("noticia_sem_corpo.html"))
+    assert noticia["titulo"] == "MME publica diretrizes para armazenamento de energia"
+    assert extrair_data_limpa(noticia["data_bruta"]) == "13/01/2026"
+    assert noticia["texto"] == ""
+    assert precisa_fallback(noticia)
+
+
+def test_fallback_so_sem_titulo_ou_corpo():
+    assert precisa_fallback({"titulo": "", "data_bruta": "", "texto": "corpo"})
+    assert not precisa_fallback({"titulo": "Título", "data_bruta": "", "texto": "corpo"})
@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from sincronizacao import Manifesto, hash_conteudo, sincronizar
+from supabase_falso import ClienteSupabaseFalso
+from uploader import UploaderSupabase
+
+
+def registro(i, titulo=None):
+    return {"data_noticia": "2026-01-14", "fonte": "Agência iNFRA", "categoria": "Energia",
+            "titulo": titulo or f"Notícia {i}", "conteudo": f"Corpo da notícia {i}",
+            "link": f"https://agenciainfra.com/blog/noticia-{i}/"}
+
+
+@pytest.fixture
+def ambiente(tmp_path):
+    cliente = ClienteSupabaseFalso()
+    uploader = UploaderSupabase(cliente, workers=2, espera_base=0.0, arquivo_falhas=str(tmp_path / "falhas.jsonl"))
+    return cliente, uploader, str(tmp_path / "manifesto.json")
+
+
+def test_primeira_sincronizacao_envia_tudo(ambiente):
+    cliente, uploader, caminho = ambiente
+    registros = [registro(i) for i in range(30)]
+    relatorio = sincronizar(registros, Manifesto.carregar(caminho), uploader.enviar)
+    assert relatorio["novos"] == relatorio["a_enviar"] == relatorio["enviados"] == 30
+    assert relatorio["falhas"] == 0
+    assert len(cliente.tabelas["noticias_infra"]) == 30
+    assert len(Manifesto.carregar(caminho).hashes) == 30
+
+
+def test_segunda_rodada_sem_mudancas_nao_envia(ambiente):
+    cliente, uploader, caminho = ambiente
+    registros = [registro(i) for i in range(30)]
+    sincronizar(registros, Manifesto.carregar(caminho), uploader.enviar)
+    chamadas = cliente.chamadas
+    relatorio = sincronizar(registros, Manifesto.carregar(caminho), uploader.enviar)
+    assert relatorio["inalterados"] == 30
+    assert relatorio["a_enviar"] == relatorio["enviados"] == 0
+    assert cliente.chamadas == chamadas
+
+
+def test_linha_editada_e_reenviada(ambiente):
+    cliente, uploader, caminho = ambiente
+    registros = [registro(i) for i in range(30)]
+    sincronizar(registros, Manifesto.carregar(caminho), uploader.enviar)
+    registros[7] = registro(7, titulo="Título corrigido")
+    enviadas = cliente.linhas_enviadas
+    relatorio = sincronizar(registros, Manifesto.carregar(caminho), uploader.enviar)
+    assert (relatorio["novos"], relatorio["alterados"], relatorio["enviados"]) == (0, 1, 1)
+    assert cliente.linhas_enviadas - enviadas == 1
+    assert cliente.tabelas["noticias_infra"][registros[7]["link"]]["titulo"] == "Título corrigido"
+    assert Manifesto.carregar(caminho).hashes[registros[7]["link"]] == hash_conteudo(registros[7])
+
+
+def test_modo_completo_reenvia_e_reconcilia_o_manifesto(ambiente):
+    cliente, uploader, caminho = ambiente
+    registros = [registro(i) for i in range(30)]
+    manifesto = Manifesto.carregar(caminho)
+    sincronizar(registros, manifesto, uploader.enviar)
+    # Link que não existe mais na base local: só a reconciliação o tira do manifesto
+    manifesto.hashes["https://agenciainfra.com/blog/removida/"] = "0" * 40
+    manifesto.salvar()
+    relatorio = sincronizar(registros, Manifesto.carregar(caminho), uploader.enviar, completo=True)
+    assert relatorio["inalterados"] == 30
+    assert relatorio["a_enviar"] == relatorio["enviados"] == 30
+    assert Manifesto.carregar(caminho).hashes == {r["link"]: hash_conteudo(r) for r in registros}
+
+
+def test_simulacao_so_conta(ambiente):
+    cliente, uploader, caminho = ambiente
+    registros = [registro(i) for i in range(30)]
+    sincronizar(registros[:20], Manifesto.carregar(caminho), uploader.enviar)
+    registros[3] = registro(3, titulo="Editada")
+    chamadas = cliente.chamadas
+    relatorio = sincronizar(registros, Manifesto.carregar(caminho), uploader.enviar, simulacao=True)
+    assert (relatorio["novos"], relatorio["alterados"], relatorio["inalterados"]) == (10, 1, 19)
+    assert relatorio["a_enviar"] == 11
+    assert relatorio["enviados"] == 0
+    assert cliente.chamadas == chamadas
+    assert len(Manifesto.carregar(caminho).hashes) == 20
+
+
+def test_simulacao_sem_manifesto_nao_grava_arquivo(ambiente):
+    cliente, _, caminho = ambiente
+    relatorio = sincronizar([registro(i) for i in range(5)], Manifesto.carregar(caminho), None, simulacao=True)
+    assert relatorio["a_enviar"] == 5
+    assert not os.path.exists(caminho)
+    assert cliente.chamadas == 0
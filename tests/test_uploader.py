@@ -0,0 +1,54 @@
+from supabase_falso import ClienteSupabaseFalso
+from uploader import UploaderSupabase, erro_de_dados
+
+
+def registros(n):
+    return [{"titulo": f"Notícia {i}", "link": f"https://agenciainfra.com/blog/noticia-{i}/"} for i in range(n)]
+
+
+def uploader(cliente, tmp_path, esperas=None):
+    return UploaderSupabase(cliente, workers=3, max_linhas=100, arquivo_falhas=str(tmp_path / "falhas.jsonl"),
+                            dormir=(esperas.append if esperas is not None else lambda _: None))
+
+
+def test_linha_recusada_e_isolada_pela_bisseccao(tmp_path):
+    envenenada = registros(1000)[437]["link"]
+    cliente = ClienteSupabaseFalso(falhar=lambda _n, linhas: "23502" if any(l["link"] == envenenada for l in linhas) else None)
+    envio = uploader(cliente, tmp_path)
+    confirmados = envio.enviar(registros(1000))
+    assert len(confirmados) == 999
+    assert envio.falhas == 1 and envio.interrompido is None
+    assert envenenada in (tmp_path / "falhas.jsonl").read_text(encoding="utf-8")
+    assert len(cliente.tabelas["noticias_infra"]) == 999
+
+
+def test_queda_do_banco_interrompe_sem_bisseccao(tmp_path):
+    esperas = []
+    cliente = ClienteSupabaseFalso(falhar=lambda _n, _linhas: True)
+    envio = uploader(cliente, tmp_path, esperas)
+    confirmados = envio.enviar(registros(1000))
+    assert confirmados == []
+    assert envio.interrompido is not None
+    # No máximo uma rodada de retentativas por worker em andamento, nada de dividir lotes
+    assert cliente.chamadas <= envio.workers * envio.tentativas
+    assert len(esperas) <= envio.workers * (envio.tentativas - 1)
+    assert envio.falhas == 0 and not (tmp_path / "falhas.jsonl").exists()
+
+
+def test_falha_transitoria_e_retentada(tmp_path):
+    cliente = ClienteSupabaseFalso(falhar=lambda n, _linhas: n <= 2)
+    envio = uploader(cliente, tmp_path)
+    assert len(envio.enviar(registros(300))) == 300
+    assert envio.interrompido is None and envio.metricas.retentativas == 2
+
+
+class _Erro(Exception):
+    def __init__(self, code): self.code = code
+
+def test_classificacao_dos_erros():
+    assert erro_de_dados(_Erro("23505")) and erro_de_dados(_Erro("22P02")) and erro_de_dados(_Erro("PGRST204"))
+    assert erro_de_dados(_Erro(413))
+    assert not erro_de_dados(_Erro("PGRST301")) # JWT inválido
+    assert not erro_de_dados(_Erro("42501")) # sem permissão
+    assert not erro_de_dados(_Erro(503))
+    assert not erro_de_dados(ConnectionError("recusada"))
@@ -0,0 +1,190 @@
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from tqdm import tqdm
+
+from telemetria import contar, span
+
+ARQUIVO_FALHAS = "falhas_upload.jsonl"
+# Códigos (APIError.code do postgrest) de lote recusado pelo conteúdo: SQLSTATE das classes 22 (valor
+# inválido) e 23 (restrição violada), corpo/coluna inválidos no PostgREST e os 4xx de dados
+_CLASSES_SQLSTATE_DADOS = ("22", "23")
+_CODIGOS_DADOS = {"PGRST102", "PGRST204", "400", "409", "413", "422"}
+
+def erro_de_dados(erro):
+    """O banco recusou o conteúdo de alguma linha? Só então dividir o lote ajuda a isolá-la.
+
+    Conexão, autenticação, 5xx e erros sem código não: a próxima chamada falharia do mesmo jeito.
+    """
+    codigo = getattr(erro, "code", None)
+    if codigo is None: return False
+    codigo = str(codigo)
+    return (len(codigo) == 5 and codigo[:2] in _CLASSES_SQLSTATE_DADOS) or codigo in _CODIGOS_DADOS
+
+
+class EnvioInterrompido(Exception):
+    """O banco ficou indisponível (ou recusou a chave) mesmo após as retentativas"""
+
+
+def tamanho_registro(registro):
+    return len(json.dumps(registro, ensure_ascii=False, default=str).encode("utf-8"))
+
+def montar_lotes(registros, max_bytes=500_000, max_linhas=500):
+    """Agrupa os registros por tamanho do payload (bytes), e não por quantidade fixa de linhas"""
+    lotes, atual, bytes_atual = [], [], 0
+    for r in registros:
+        tamanho = tamanho_registro(r)
+        if atual and (bytes_atual + tamanho > max_bytes or len(atual) >= max_linhas):
+            lotes.append(atual)
+            atual, bytes_atual = [], 0
+        atual.append(r)
+        bytes_atual += tamanho
+    if atual: lotes.append(atual)
+    return lotes
+
+
+class MetricasUpload:
+    def __init__(self):
+        self.linhas = 0
+        self.lotes = 0
+        self.retentativas = 0
+        self.latencias = []
+        self.inicio = None # Marcado pelo primeiro enviar(), não na criação do uploader
+        self.fim = None
+        self._lock = threading.Lock()
+
+    def registrar_lote(self, linhas, latencia):
+        with self._lock:
+            self.linhas += linhas
+            self.lotes += 1
+            self.latencias.append(latencia)
+
+    def registrar_retentativa(self):
+        with self._lock: self.retentativas += 1
+
+    def iniciar(self):
+        if self.inicio is None: self.inicio = time.perf_counter()
+
+    def finalizar(self):
+        self.fim = time.perf_counter()
+
+    @property
+    def tempo_total(self):
+        if self.inicio is None: return 0.0
+        return (self.fim or time.perf_counter()) - self.inicio
+
+    @property
+    def linhas_por_segundo(self):
+        return self.linhas / self.tempo_total if self.tempo_total > 0 else 0.0
+
+    def percentil(self, p):
+        if not self.latencias: return 0.0
+        ordenadas = sorted(self.latencias)
+        return ordenadas[min(len(ordenadas) - 1, int(round(p / 100 * (len(ordenadas) - 1))))]
+
+    def resumo(self):
+        return (f"⏱️ {self.linhas} linhas em {self.lotes} lotes, {self.tempo_total:.1f}s "
+                f"({self.linhas_por_segundo:.1f} linhas/s) | latência por lote "
+                f"p50={self.percentil(50) * 1000:.0f}ms p95={self.percentil(95) * 1000:.0f}ms "
+                f"p99={self.percentil(99) * 1000:.0f}ms | {self.retentativas} retentativas")
+
+
+class UploaderSupabase:
+    """Upserts em lotes por tamanho, concorrentes, com retentativa (backoff exponencial + jitter).
+
+    Um lote que continua falhando é dividido ao meio até isolar as linhas problemáticas,
+    que vão para o arquivo de falhas (JSONL) em vez de serem descartadas em silêncio.
+    """
+
+    def __init__(self, cliente, tabela="noticias_infra", on_conflict="link", workers=3,
+                 max_bytes=500_000, max_linhas=500, tentativas=4, tentativas_bisseccao=2,
+                 espera_base=0.5, espera_max=8.0, arquivo_falhas=ARQUIVO_FALHAS, dormir=time.sleep):
+        self.cliente = cliente
+        self.tabela = tabela
+        self.on_conflict = on_conflict
+        self.workers = max(1, workers)
+        self.max_bytes = max_bytes
+        self.max_linhas = max_linhas
+        self.tentativas = tentativas
+        self.tentativas_bisseccao = tentativas_bisseccao
+        self.espera_base = espera_base
+        self.espera_max = espera_max
+        self.arquivo_falhas = arquivo_falhas
+        self.dormir = dormir
+        self.metricas = MetricasUpload()
+        self.falhas = 0
+        self.interrompido = None # Erro que parou o envio (queda, chave inválida); as linhas não enviadas ficam para a próxima
+        self._lock_falhas = threading.Lock()
+
+    def _upsert(self, lote):
+        inicio = time.perf_counter()
+        with span("supabase.upsert", linhas=len(lote)):
+            self.cliente.table(self.tabela).upsert(lote, on_conflict=self.on_conflict).execute()
+        self.metricas.registrar_lote(len(lote), time.perf_counter() - inicio)
+
+    def _com_retentativa(self, lote, tentativas):
+        for tentativa in range(tentativas):
+            if self.interrompido: raise EnvioInterrompido(self.interrompido)
+            try:
+                self._upsert(lote)
+                return
+            except Exception as e:
+                # Linha recusada pelo conteúdo não passa na próxima tentativa: vai direto para a bissecção
+                if erro_de_dados(e) or tentativa == tentativas - 1: raise
+                self.metricas.registrar_retentativa()
+                contar("supabase.retentativa")
+                espera = min(self.espera_max, self.espera_base * 2 ** tentativa)
+                self.dormir(random.uniform(0, espera)) # "full jitter"
+
+    def _registrar_falha(self, registro, erro):
+        with self._lock_falhas:
+            self.falhas += 1
+            contar("supabase.linha_descartada")
+            with open(self.arquivo_falhas, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"quando": datetime.now().isoformat(timespec="seconds"), "erro": str(erro),
+                                    "registro": registro}, ensure_ascii=False, default=str) + "\n")
+
+    def _enviar_lote(self, lote, tentativas):
+        """Devolve os registros confirmados; bissecta o lote se o banco recusar alguma linha"""
+        if self.interrompido: return []
+        try:
+            self._com_retentativa(lote, tentativas)
+            return lote
+        except EnvioInterrompido:
+            return []
+        except Exception as e:
+            if not erro_de_dados(e):
+                # Queda, chave inválida ou 5xx: dividir o lote só multiplicaria as chamadas. Para o envio todo
+                with self._lock_falhas:
+                    if not self.interrompido:
+                        self.interrompido = e
+                        contar("supabase.envio_interrompido")
+                return []
+            if len(lote) == 1:
+                self._registrar_falha(lote[0], e)
+                return []
+            meio = len(lote) // 2
+            return (self._enviar_lote(lote[:meio], self.tentativas_bisseccao) +
+                    self._enviar_lote(lote[meio:], self.tentativas_bisseccao))
+
+    def enviar(self, registros):
+        """Envia todos os registros e devolve os que foram confirmados pelo banco.
+
+        Se o banco cair, os lotes restantes não são enviados (ver `interrompido`).
+        """
+        self.metricas.iniciar()
+        lotes = montar_lotes(registros, self.max_bytes, self.max_linhas)
+        confirmados = []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futuros = [pool.submit(self._enviar_lote, lote, self.tentativas) for lote in lotes]
+            for futuro in tqdm(as_completed(futuros), total=len(futuros)):
+                confirmados.extend(futuro.result())
+        self.metricas.finalizar()
+        if self.interrompido:
+            print(f"⛔ Envio interrompido após as retentativas: {self.interrompido} "
+                  f"({len(registros) - len(confirmados)} linhas ficam para a próxima execução)")
+        return confirmados